@@ -4,8 +4,14 @@ GitTensor Database Layer
 A shared database abstraction layer for GitTensor validator and API services.
 """
 
-from .connection.database import create_database_connection, test_database_connection
-from .migrations.migrator import DatabaseMigrator
+from .connection.database import (
+    create_database_connection,
+    database_connection,
+    test_database_connection,
+    close_database_pool,
+    create_async_database_pool,
+)
+from .migrations.migrator import DatabaseMigrator, MigrationHelpers
 from .repositories import (
     BaseRepository,
     MinersRepository,
@@ -14,18 +20,26 @@ from .repositories import (
     IssuesRepository,
     FileChangesRepository,
     MinerEvaluationsRepository,
+    AsyncBaseRepository,
+    AsyncMinersRepository,
 )
 
 __version__ = "0.1.0"
 __all__ = [
     "create_database_connection",
+    "database_connection",
     "test_database_connection",
+    "close_database_pool",
+    "create_async_database_pool",
     "BaseRepository",
     "DatabaseMigrator",
+    "MigrationHelpers",
     "MinersRepository",
     "RepositoriesRepository",
     "PullRequestsRepository",
     "IssuesRepository",
     "FileChangesRepository",
     "MinerEvaluationsRepository",
+    "AsyncBaseRepository",
+    "AsyncMinersRepository",
 ]
\ No newline at end of file
@@ -2,51 +2,191 @@
 Database connection utility for validator storage operations.
 """
 import os
-from typing import Optional
-import bittensor as bt
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
 
 try:
     import psycopg2
     from psycopg2.extras import RealDictCursor
+    from psycopg2.pool import ThreadedConnectionPool
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
-    bt.logging.warning("psycopg2 not installed. Database storage features will be disabled.")
+    logger.warning("psycopg2 not installed. Database storage features will be disabled.")
+
+# asyncpg is optional and only imported when an async pool is created
+ASYNCPG_AVAILABLE = find_spec('asyncpg') is not None
+
+# Module-level connection pool, lazily created on first use
+_POOL: Optional['ThreadedConnectionPool'] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _return_to_pool(pool, raw_connection) -> None:
+    """Hand a raw connection back to its pool, ignoring pools that were already closed"""
+    try:
+        pool.putconn(raw_connection)
+    except Exception as e:
+        logger.debug(f"Could not return connection to pool: {e}")
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a connection checked out of the module-level pool.
+
+    Attribute access is forwarded to the underlying psycopg2 connection, but
+    close() hands the connection back to the pool instead of closing it. A
+    wrapper that is garbage-collected without close() also returns its
+    connection, so a forgotten close() cannot leak a pool slot.
+    """
+
+    def __init__(self, pool, raw_connection):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_raw', raw_connection)
+        object.__setattr__(self, '_finalizer', weakref.finalize(self, _return_to_pool, pool, raw_connection))
+
+    def _connection(self):
+        """The underlying connection, raising like psycopg2 does once it has been closed"""
+        raw = self._raw
+        if raw is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return raw
+
+    def __getattr__(self, name):
+        return getattr(self._connection(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection(), name, value)
+
+    def __enter__(self):
+        self._connection().__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._connection().__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def closed(self) -> bool:
+        return self._raw is None or bool(self._raw.closed)
+
+    def close(self) -> None:
+        """Return the underlying connection to the pool."""
+        if self._raw is not None:
+            object.__setattr__(self, '_raw', None)
+            self._finalizer()
+
+
+@lru_cache(maxsize=1)
+def _db_config() -> Dict[str, Any]:
+    """
+    Parse database settings from environment variables once per process.
+    Call _db_config.cache_clear() to pick up changed environment variables.
+
+    Returns:
+        Keyword arguments for psycopg2.connect
+    """
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 5432)),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'database': os.getenv('DB_NAME', 'gittensor_validator'),
+    }
+
+
+def _get_pool() -> 'ThreadedConnectionPool':
+    """
+    Get the module-level connection pool, creating it from environment variables on first use.
+
+    Returns:
+        Shared ThreadedConnectionPool instance
+    """
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                # Repositories map rows by column name, so hand out dict rows by default
+                _POOL = ThreadedConnectionPool(
+                    minconn=int(os.getenv('DB_POOL_MIN', 1)),
+                    maxconn=int(os.getenv('DB_POOL_MAX', 10)),
+                    cursor_factory=RealDictCursor,
+                    **_db_config()
+                )
+    return _POOL
+
+
+def close_database_pool() -> None:
+    """
+    Close every connection held by the module-level pool.
+    The next call to create_database_connection will re-read the environment
+    and build a fresh pool.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.closeall()
+            _POOL = None
+        _db_config.cache_clear()
 
 
 def create_database_connection() -> Optional[object]:
     """
-    Create a PostgreSQL database connection using environment variables.
+    Get a PostgreSQL database connection from the shared connection pool.
+
+    Calling close() on the returned connection returns it to the pool. The pool
+    does not block when all DB_POOL_MAX connections are checked out: this call
+    then fails and returns None, so release connections promptly.
 
     Returns:
         Database connection if successful, None otherwise
     """
     if not POSTGRES_AVAILABLE:
-        bt.logging.error("Cannot create database connection: psycopg2 not installed")
+        logger.error("Cannot create database connection: psycopg2 not installed")
         return None
 
     try:
-        db_config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'port': int(os.getenv('DB_PORT', 5432)),
-            'user': os.getenv('DB_USER', 'postgres'),
-            'password': os.getenv('DB_PASSWORD', ''),
-            'database': os.getenv('DB_NAME', 'gittensor_validator'),
-        }
-
-        connection = psycopg2.connect(**db_config)
+        pool = _get_pool()
+        connection = PooledConnection(pool, pool.getconn())
         connection.autocommit = False
-        bt.logging.success("Successfully connected to PostgreSQL database for validation result storage")
+        logger.info("Successfully connected to PostgreSQL database for validation result storage")
         return connection
 
     except psycopg2.Error as e:
-        bt.logging.error(f"Failed to connect to database: {e}")
+        logger.error(f"Failed to connect to database: {e}")
         return None
     except Exception as e:
-        bt.logging.error(f"Unexpected error connecting to database: {e}")
+        logger.error(f"Unexpected error connecting to database: {e}")
         return None
 
 
+@contextmanager
+def database_connection() -> Iterator[Optional[object]]:
+    """
+    Check out a connection from the shared pool for the duration of a with block.
+
+    Lets short-lived units of work (a request handler, a worker task) hold a
+    connection only while they run instead of keeping one per repository for the
+    life of the process. Repositories built on the connection should be closed
+    before the block ends.
+
+    Yields:
+        Database connection if successful, None otherwise
+    """
+    connection = create_database_connection()
+    try:
+        yield connection
+    finally:
+        if connection is not None:
+            connection.close()
+
+
 def test_database_connection() -> bool:
     """
     Test if database connection is working.
@@ -54,12 +194,37 @@ def test_database_connection() -> bool:
     Returns:
         True if connection successful, False otherwise
     """
-    connection = create_database_connection()
-    if connection:
-        try:
-            connection.close()
-            return True
-        except Exception as e:
-            bt.logging.error(f"Error closing test connection: {e}")
-            return False
-    return False
\ No newline at end of file
+    if not POSTGRES_AVAILABLE:
+        return False
+
+    try:
+        pool = _get_pool()
+        connection = pool.getconn()
+        pool.putconn(connection)
+        return True
+    except Exception as e:
+        logger.error(f"Error testing database connection: {e}")
+        return False
+
+
+async def create_async_database_pool(min_size: int = 4, max_size: int = 32) -> Optional[object]:
+    """
+    Create an asyncpg connection pool from the same environment variables as the psycopg2 pool.
+
+    Args:
+        min_size: Connections opened up front
+        max_size: Upper bound on concurrent connections
+
+    Returns:
+        asyncpg Pool if successful, None otherwise
+    """
+    if not ASYNCPG_AVAILABLE:
+        logger.error("Cannot create async database pool: asyncpg not installed")
+        return None
+
+    try:
+        import asyncpg
+        return await asyncpg.create_pool(min_size=min_size, max_size=max_size, **_db_config())
+    except Exception as e:
+        logger.error(f"Failed to create async database pool: {e}")
+        return None
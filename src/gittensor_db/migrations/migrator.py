@@ -2,10 +2,42 @@
 """
 Database migration system for gittensor-db
 """
-import os
 import logging
-from typing import List, Optional
-import pkg_resources
+from functools import lru_cache
+from importlib.util import module_from_spec, spec_from_file_location
+from types import ModuleType
+from typing import Any, Iterable, List, Optional, Sequence
+
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+try:
+    from importlib.resources import as_file, files
+except ImportError:
+    # Python 3.8 ships importlib.resources without files()/as_file()
+    from importlib_resources import as_file, files
+
+
+class MigrationHelpers:
+    """Helpers available to Python migration modules"""
+
+    @staticmethod
+    def bulk_insert(cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]], page_size: int = 1000) -> None:
+        """
+        Insert many rows with a single multi-row INSERT per page instead of one statement per row.
+
+        Args:
+            cursor: Cursor of the migration's transaction
+            table: Target table name
+            columns: Column names matching the order of values in each row
+            rows: Row value tuples
+            page_size: Rows sent per INSERT statement
+        """
+        query = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+            sql.Identifier(table),
+            sql.SQL(', ').join(sql.Identifier(column) for column in columns)
+        )
+        execute_values(cursor, query.as_string(cursor), rows, page_size=page_size)
 
 
 class DatabaseMigrator:
@@ -16,63 +48,91 @@ class DatabaseMigrator:
         self.logger = logging.getLogger(__name__)
         
     def get_migration_files(self) -> List[str]:
-        """Get list of SQL migration files in order"""
+        """
+        Get list of migration files in order.
+
+        Entries are .sql files, or .py modules defining migrate(cursor) for migrations
+        that seed data through MigrationHelpers.
+        """
         migration_order = [
             'repositories.sql',
             'miners.sql',
             'miner_evaluations.sql',
             'pull_requests.sql',
+            'pull_requests_miner_score_index.sql',
             'issues.sql',
             'file_changes.sql'
         ]
         return migration_order
     
-    def read_migration_file(self, filename: str) -> str:
-        """Read migration SQL from package resources"""
-        try:
-            # Try to read from package resources first
-            sql_content = pkg_resources.resource_string(
-                'gittensor_db', f'migrations/sql/{filename}'
-            ).decode('utf-8')
-            return sql_content
-        except Exception:
-            # Fallback to file system
-            migration_path = os.path.join(
-                os.path.dirname(__file__), 'sql', filename
-            )
-            with open(migration_path, 'r') as f:
-                return f.read()
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def read_migration_file(filename: str) -> str:
+        """Read migration SQL from package resources (cached, the files are immutable package data)"""
+        return (files(__package__) / 'sql' / filename).read_text(encoding='utf-8')
+
+    @staticmethod
+    def load_python_migration(filename: str) -> ModuleType:
+        """Load a Python migration module shipped alongside the SQL files"""
+        with as_file(files(__package__) / 'sql' / filename) as path:
+            spec = spec_from_file_location(f"{__package__}.sql.{filename[:-len('.py')]}", path)
+            module = module_from_spec(spec)
+            spec.loader.exec_module(module)
+        return module
     
-    def run_migration(self, filename: str) -> bool:
-        """Run a single migration file"""
+    def run_migration(self, filename: str, savepoint: Optional[str] = None) -> bool:
+        """
+        Run a single migration file.
+
+        Without a savepoint the migration is committed on its own. With a savepoint it
+        runs inside the caller's transaction: the savepoint is released on success and
+        rolled back to on failure, leaving the outer transaction usable.
+        """
+        savepoint_created = False
         try:
-            sql_content = self.read_migration_file(filename)
+            if filename.endswith('.py'):
+                migration_module = self.load_python_migration(filename)
+            else:
+                sql_content = self.read_migration_file(filename)
             
             with self.db.cursor() as cursor:
-                # Split on semicolons and execute each statement
-                statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                
-                for statement in statements:
-                    if statement:
-                        cursor.execute(statement)
-                
+                if savepoint:
+                    cursor.execute(f"SAVEPOINT {savepoint}")
+                    savepoint_created = True
+
+                if filename.endswith('.py'):
+                    migration_module.migrate(cursor)
+                else:
+                    # psycopg2 runs multi-statement strings in a single round-trip
+                    cursor.execute(sql_content)
+
+                if savepoint:
+                    cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+            
+            if not savepoint:
                 self.db.commit()
-                self.logger.info(f"Successfully ran migration: {filename}")
-                return True
+            self.logger.info(f"Successfully ran migration: {filename}")
+            return True
                 
         except Exception as e:
-            self.db.rollback()
+            if savepoint_created:
+                with self.db.cursor() as cursor:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            elif not savepoint:
+                self.db.rollback()
             self.logger.error(f"Failed to run migration {filename}: {e}")
             return False
     
     def migrate(self) -> bool:
-        """Run all migrations in order"""
+        """Run all migrations in order within a single transaction, one savepoint per file"""
         migration_files = self.get_migration_files()
         
-        for filename in migration_files:
-            if not self.run_migration(filename):
-                self.logger.error(f"Migration failed at {filename}")
-                return False
+        with self.db:
+            for index, filename in enumerate(migration_files):
+                if not self.run_migration(filename, savepoint=f"migration_{index}"):
+                    self.logger.error(f"Migration failed at {filename}")
+                    self.db.rollback()
+                    return False
         
         self.logger.info("All migrations completed successfully")
         return True
@@ -0,0 +1,6 @@
+-- Covering index for per-miner PR listings (GET_PULL_REQUESTS_BY_MINER)
+-- Matches the miner filter and the earned_score/merged_at ordering so the scoreboard read is an ordered
+-- index scan instead of a filter + sort. CONCURRENTLY is not used because migrations run in one transaction.
+CREATE INDEX IF NOT EXISTS idx_pull_requests_miner_score
+    ON pull_requests (uid, hotkey, github_id, earned_score DESC, merged_at DESC)
+    INCLUDE (number, repository_full_name);
@@ -0,0 +1,56 @@
+"""
+Numeric kernels for aggregating pull request metrics.
+
+Numba is an optional dependency; when it is not installed callers keep using
+their plain Python loops. Numba itself is only imported on first use since
+importing it costs more than most callers will ever save.
+"""
+from importlib.util import find_spec
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUMBA_AVAILABLE = find_spec('numba') is not None
+
+# Below this many PRs building the input arrays costs more than the jitted loop saves
+JIT_MIN_PULL_REQUESTS = 256
+
+
+def _aggregate_pull_request_totals(additions: np.ndarray, deletions: np.ndarray, scores: np.ndarray):
+    """
+    Sum lines changed and earned score over parallel PR arrays.
+
+    Returns:
+        Tuple of (total_lines_changed, total_score)
+    """
+    total_lines = 0
+    total_score = 0.0
+    for i in range(additions.shape[0]):
+        total_lines += additions[i] + deletions[i]
+        total_score += scores[i]
+    return total_lines, total_score
+
+
+_compiled_aggregate = None
+
+
+def aggregate_pull_request_totals(additions: np.ndarray, deletions: np.ndarray, scores: np.ndarray):
+    """Jitted entry point for _aggregate_pull_request_totals, compiled on first call"""
+    global _compiled_aggregate
+    if _compiled_aggregate is None:
+        _compiled_aggregate = _aggregate_pull_request_totals
+        if NUMBA_AVAILABLE:
+            try:
+                from numba import njit
+                jitted = njit(cache=True)(_aggregate_pull_request_totals)
+                # njit compiles lazily, so compile (or load the on-disk cache) now, inside the try
+                totals = jitted(additions, deletions, scores)
+            except Exception as e:
+                # Installed but unusable (e.g. built against another numpy, a compile error, or
+                # an unwritable cache directory on a read-only install); keep the Python loop
+                logger.warning(f"numba JIT unavailable, aggregating without it: {e}")
+            else:
+                _compiled_aggregate = jitted
+                return totals
+    return _compiled_aggregate(additions, deletions, scores)
@@ -2,14 +2,29 @@
 Domain models for GitTensor database operations.
 These mirror your gittensor.classes but are self-contained.
 """
+import sys
 from dataclasses import dataclass, field
-from typing import DefaultDict, Optional, List, Set, Callable
+from functools import lru_cache
+from typing import DefaultDict, Optional, List, FrozenSet, Callable
 from datetime import datetime
+import numpy as np
 from ..utils.utils import parse_github_timestamp
+from ._kernels import NUMBA_AVAILABLE, JIT_MIN_PULL_REQUESTS, aggregate_pull_request_totals
 
 GITHUB_DOMAIN = 'https://github.com/'
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__; slots=True requires Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=4096)
+def _file_extension(filename: str) -> str:
+    """Lowercased extension of filename without the dot, or "" if it has none. Memoized since PRs repeat filenames."""
+    _, sep, extension = filename.rpartition(".")
+    return extension.lower() if sep else ""
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Miner:
     """Miner identity"""
     uid: int
@@ -19,20 +34,22 @@ class Miner:
     def __str__(self) -> str:
         return f"Miner(uid={self.uid}, hotkey={self.hotkey[:8]}..., github_id={self.github_id})"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Repository:
     """Repository information"""
     name: str
     owner: str
+    full_name: str = field(init=False, repr=False, compare=False)
+    github_url: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def full_name(self) -> str:
-        return f"{self.owner}/{self.name}"
+    def __post_init__(self):
+        self.full_name = f"{self.owner}/{self.name}"
+        self.github_url = GITHUB_DOMAIN + self.full_name
 
     def construct_github_url(self) -> str:
-        return GITHUB_DOMAIN + self.full_name
+        return self.github_url
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FileChange:
     """Represents a single file change in a PR"""
     pr_number: int
@@ -48,10 +65,10 @@ class FileChange:
 
     def __post_init__(self):
         if self.file_extension is None:
-            self.file_extension = self._calculate_file_extension()
+            self.file_extension = _file_extension(self.filename)
 
     def _calculate_file_extension(self) -> str:
-        return self.filename.split(".")[-1].lower() if "." in self.filename else ""
+        return _file_extension(self.filename)
     
     @classmethod
     def from_github_response(cls, pr_number: int, repository_full_name: str, file_diff: DefaultDict) -> 'FileChange':
@@ -66,7 +83,7 @@ class FileChange:
             status=file_diff['status'],
             patch=file_diff.get('patch')
         )
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Issue:
     """Represents an issue that belongs to a pull request"""
     number: int
@@ -79,7 +96,7 @@ class Issue:
     def construct_github_url(self) -> str:
         return GITHUB_DOMAIN + f"{self.repository_full_name}/issues/{self.number}"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PullRequest:
     """Represents a merged pull request with relevant metadata"""
     number: int  
@@ -117,45 +134,69 @@ class PullRequest:
     @classmethod
     def from_graphql_response(cls, pr_data: dict, uid: int, hotkey: str, github_id: str) -> 'PullRequest':
         """Create PullRequest from GraphQL API response"""
-        repo_data = pr_data['repository']
-        repository_full_name = f"{repo_data['owner']['login']}/{repo_data['name']}"
-
-        raw_issues = pr_data['closingIssuesReferences']['nodes']
-        issues = []
-        for issue in raw_issues:
-            if issue['closedAt']:
-                issues.append(Issue(
-                    number=issue['number'],
-                    pr_number=pr_data['number'],
-                    repository_full_name=repository_full_name,
-                    title=issue['title'],
-                    created_at=parse_github_timestamp(issue['createdAt']),
-                    closed_at=parse_github_timestamp(issue['closedAt']),
-                ))
+        return cls.from_graphql_batch([pr_data], uid, hotkey, github_id)[0]
 
-        return cls(
-            number=pr_data['number'],
-            repository_full_name=repository_full_name,
-            uid=uid,
-            hotkey=hotkey,
-            github_id=github_id,
-            title=pr_data['title'],
-            author_login=pr_data['author']['login'],
-            merged_at=parse_github_timestamp(pr_data['mergedAt']),
-            created_at=parse_github_timestamp(pr_data['createdAt']),
-            additions=pr_data['additions'],
-            deletions=pr_data['deletions'],
-            commits=pr_data.get('commits', {}).get('totalCount', 0),
-            merged_by_login=pr_data['mergedBy']['login'] if pr_data.get('mergedBy') else None,
-            issues=issues
-        )
+    @classmethod
+    def from_graphql_batch(cls, nodes: List[dict], uid: int, hotkey: str, github_id: str) -> List['PullRequest']:
+        """
+        Create PullRequests from a page of GraphQL API pull request nodes.
+
+        Args:
+            nodes: Pull request nodes from a GraphQL response page
+            uid: Miner UID
+            hotkey: Miner hotkey
+            github_id: Miner GitHub ID
+
+        Returns:
+            List of PullRequest objects in node order
+        """
+        # Bind hot globals locally once for the whole page
+        _ts = parse_github_timestamp
+        _Issue = Issue
+
+        pull_requests = []
+        for pr_data in nodes:
+            repo_data = pr_data['repository']
+            repository_full_name = f"{repo_data['owner']['login']}/{repo_data['name']}"
+            number = pr_data['number']
+            merged_by = pr_data.get('mergedBy')
+
+            pull_requests.append(cls(
+                number=number,
+                repository_full_name=repository_full_name,
+                uid=uid,
+                hotkey=hotkey,
+                github_id=github_id,
+                title=pr_data['title'],
+                author_login=pr_data['author']['login'],
+                merged_at=_ts(pr_data['mergedAt']),
+                created_at=_ts(pr_data['createdAt']),
+                additions=pr_data['additions'],
+                deletions=pr_data['deletions'],
+                commits=pr_data.get('commits', {}).get('totalCount', 0),
+                merged_by_login=merged_by['login'] if merged_by else None,
+                issues=[
+                    _Issue(
+                        number=issue['number'],
+                        pr_number=number,
+                        repository_full_name=repository_full_name,
+                        title=issue['title'],
+                        created_at=_ts(issue['createdAt']),
+                        closed_at=_ts(issue['closedAt']),
+                    )
+                    for issue in pr_data['closingIssuesReferences']['nodes']
+                    if issue['closedAt']
+                ]
+            ))
+
+        return pull_requests
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class MinerEvaluation:
     uid: int
     hotkey: str
-    github_id: Optional[str] = 0  # will be 0 if miner failed
+    github_id: str = '0'  # will be '0' if miner failed
     github_pat: Optional[str] = None
     id: Optional[int] = None  # db pk... generated by db
     total_score: float = 0.0
@@ -165,7 +206,7 @@ class MinerEvaluation:
     failed_reason: Optional[str] = None
     evaluation_timestamp: Optional[datetime] = None 
     pull_requests: List[PullRequest] = field(default_factory=list)
-    unique_repos_contributed_to: Set[str] = field(default_factory=set)
+    unique_repos_contributed_to: FrozenSet[str] = field(default_factory=frozenset)
     stored_total_prs: Optional[int] = None
 
     @property
@@ -173,14 +214,41 @@ class MinerEvaluation:
         """Total number of valid PRs - uses stored DB value if available, otherwise computes from pull_requests"""
         return self.stored_total_prs if self.stored_total_prs is not None else len(self.pull_requests)
 
-    def calculate_metric_totals(self):
-        """Calculate total lines changed and unique repositories from PRs"""
+    def calculate_metric_totals(self, include_score: bool = False):
+        """
+        Calculate total lines changed and unique repositories from PRs in a single pass.
+
+        Args:
+            include_score: Also sum earned scores into total_score during the same pass
+        """
         if not self.pull_requests:
             return
 
-        self.total_lines_changed = sum(pr.total_changes for pr in self.pull_requests)
-        self.unique_repos_contributed_to = set(pr.repository_full_name for pr in self.pull_requests)
-        self.unique_repos_count = len(self.unique_repos_contributed_to)
+        pull_requests = self.pull_requests
+        count = len(pull_requests)
+        if NUMBA_AVAILABLE and count >= JIT_MIN_PULL_REQUESTS:
+            lines, score = aggregate_pull_request_totals(
+                np.fromiter((pr.additions for pr in pull_requests), dtype=np.int64, count=count),
+                np.fromiter((pr.deletions for pr in pull_requests), dtype=np.int64, count=count),
+                np.fromiter((pr.earned_score for pr in pull_requests), dtype=np.float64, count=count),
+            )
+            lines, score = int(lines), float(score)
+            repos = {pr.repository_full_name for pr in pull_requests}
+        else:
+            lines = 0
+            score = 0.0
+            repos = set()
+            for pr in pull_requests:
+                lines += pr.additions + pr.deletions
+                score += pr.earned_score
+                repos.add(pr.repository_full_name)
+
+        self.total_lines_changed = lines
+        # Read-only after this point; frozenset drops the growth slack of the build set
+        self.unique_repos_contributed_to = frozenset(repos)
+        self.unique_repos_count = len(repos)
+        if include_score:
+            self.total_score = score
 
     def calculate_score_total(self):
         """Calculate total score by summing earned scores from all PRs"""
@@ -195,7 +263,7 @@ class MinerEvaluation:
             min_weight: Minimum weight (maximum penalty)
             penalty_slope: How steep the penalty curve is
         """
-        if self.total_open_prs <= threshold:
+        if self.total_score == 0.0 or self.total_open_prs <= threshold:
             return 1.0
         weight = max(min_weight, 1.0 - self.total_open_prs * penalty_slope)
         self.total_score = weight * self.total_score
@@ -13,6 +13,7 @@ __all__ = [
     'GET_MINER_BY_HOTKEY_AND_GITHUB_ID',
     'SET_MINER',
     'UPSERT_MINER',
+    'UPSERT_MINER_RETURNING',
     'GET_ALL_MINERS',
 
     # Repository queries
@@ -26,15 +27,20 @@ __all__ = [
     'GET_PULL_REQUESTS_BY_REPOSITORY',
     'GET_PULL_REQUESTS_BY_MINER',
     'GET_PULL_REQUEST_WITH_FILE_CHANGES',
+    'GET_PULL_REQUEST_WITH_FILE_CHANGES_META',
 
     # File Change queries
     'GET_FILE_CHANGE',
     'GET_FILE_CHANGES_BY_PR',
+    'GET_FILE_CHANGES_FOR_PRS',
+    'GET_FILE_CHANGES_BY_PR_NUMBERS',
+    'GET_FILE_CHANGES_BY_PR_NUMBERS_META',
     'SET_FILE_CHANGES_FOR_PR',
 
     # Miner Evaluation queries
     'GET_MINER_EVALUATION',
     'GET_LATEST_MINER_EVALUATION',
+    'GET_LATEST_MINER_EVALUATIONS_FOR_MINERS',
     'SET_MINER_EVALUATION',
     'GET_EVALUATIONS_BY_TIMEFRAME',
 
@@ -44,6 +44,15 @@ DO UPDATE SET
     updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
 """
 
+UPSERT_MINER_RETURNING = """
+INSERT INTO miners (uid, hotkey, github_id)
+VALUES (%s, %s, %s)
+ON CONFLICT (uid, hotkey, github_id)
+DO UPDATE SET
+    updated_at = CURRENT_TIMESTAMP AT TIME ZONE 'America/Chicago'
+RETURNING uid, hotkey, github_id, created_at, updated_at
+"""
+
 GET_ALL_MINERS = """
 SELECT uid, hotkey, github_id, created_at, updated_at
 FROM miners
@@ -75,9 +84,10 @@ GET_PULL_REQUEST = """
 SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
        pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
        pr.additions, pr.deletions, pr.commits, pr.author_login,
-       pr.merged_by_login, r.name, r.owner
+       pr.merged_by_login,
+       split_part(pr.repository_full_name, '/', 2) AS name,
+       split_part(pr.repository_full_name, '/', 1) AS owner
 FROM pull_requests pr
-JOIN repositories r ON pr.repository_full_name = r.full_name
 WHERE pr.number = %s AND pr.repository_full_name = %s
 """
 
@@ -95,9 +105,10 @@ GET_PULL_REQUESTS_BY_REPOSITORY = """
 SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
        pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
        pr.additions, pr.deletions, pr.commits, pr.author_login,
-       pr.merged_by_login, r.name, r.owner
+       pr.merged_by_login,
+       split_part(pr.repository_full_name, '/', 2) AS name,
+       split_part(pr.repository_full_name, '/', 1) AS owner
 FROM pull_requests pr
-JOIN repositories r ON pr.repository_full_name = r.full_name
 WHERE pr.repository_full_name = %s
 ORDER BY pr.merged_at DESC
 """
@@ -106,9 +117,10 @@ GET_PULL_REQUESTS_BY_MINER = """
 SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
        pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
        pr.additions, pr.deletions, pr.commits, pr.author_login,
-       pr.merged_by_login, r.name, r.owner
+       pr.merged_by_login,
+       split_part(pr.repository_full_name, '/', 2) AS name,
+       split_part(pr.repository_full_name, '/', 1) AS owner
 FROM pull_requests pr
-JOIN repositories r ON pr.repository_full_name = r.full_name
 WHERE pr.uid = %s AND pr.hotkey = %s AND pr.github_id = %s
 ORDER BY pr.earned_score DESC, pr.merged_at DESC
 """
@@ -117,11 +129,27 @@ GET_PULL_REQUEST_WITH_FILE_CHANGES = """
 SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
        pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
        pr.additions, pr.deletions, pr.commits, pr.author_login,
-       pr.merged_by_login, r.name, r.owner,
+       pr.merged_by_login,
+       split_part(pr.repository_full_name, '/', 2) AS name,
+       split_part(pr.repository_full_name, '/', 1) AS owner,
        fc.filename, fc.changes, fc.additions as file_additions,
        fc.deletions as file_deletions, fc.status, fc.patch, fc.file_extension
 FROM pull_requests pr
-JOIN repositories r ON pr.repository_full_name = r.full_name
+LEFT JOIN file_changes fc ON pr.number = fc.pr_number AND pr.repository_full_name = fc.repository_full_name
+WHERE pr.number = %s AND pr.repository_full_name = %s
+"""
+
+# Same as GET_PULL_REQUEST_WITH_FILE_CHANGES without the (often large) patch column
+GET_PULL_REQUEST_WITH_FILE_CHANGES_META = """
+SELECT pr.number, pr.repository_full_name, pr.uid, pr.hotkey, pr.github_id,
+       pr.earned_score, pr.title, pr.merged_at, pr.pr_created_at,
+       pr.additions, pr.deletions, pr.commits, pr.author_login,
+       pr.merged_by_login,
+       split_part(pr.repository_full_name, '/', 2) AS name,
+       split_part(pr.repository_full_name, '/', 1) AS owner,
+       fc.filename, fc.changes, fc.additions as file_additions,
+       fc.deletions as file_deletions, fc.status, fc.file_extension
+FROM pull_requests pr
 LEFT JOIN file_changes fc ON pr.number = fc.pr_number AND pr.repository_full_name = fc.repository_full_name
 WHERE pr.number = %s AND pr.repository_full_name = %s
 """
@@ -141,6 +169,30 @@ WHERE pr_number = %s AND repository_full_name = %s
 ORDER BY filename
 """
 
+GET_FILE_CHANGES_FOR_PRS = """
+SELECT id, pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension, created_at
+FROM file_changes
+WHERE (pr_number, repository_full_name) IN %s
+ORDER BY repository_full_name, pr_number, filename
+"""
+
+GET_FILE_CHANGES_BY_PR_NUMBERS = """
+SELECT id, pr_number, filename, changes, additions AS file_additions, deletions AS file_deletions,
+       status, patch, file_extension
+FROM file_changes
+WHERE repository_full_name = %s AND pr_number = ANY(%s)
+ORDER BY pr_number, filename
+"""
+
+# Same as GET_FILE_CHANGES_BY_PR_NUMBERS without the patch column
+GET_FILE_CHANGES_BY_PR_NUMBERS_META = """
+SELECT id, pr_number, filename, changes, additions AS file_additions, deletions AS file_deletions,
+       status, file_extension
+FROM file_changes
+WHERE repository_full_name = %s AND pr_number = ANY(%s)
+ORDER BY pr_number, filename
+"""
+
 SET_FILE_CHANGES_FOR_PR = """
 INSERT INTO file_changes (
     pr_number, repository_full_name, filename, changes, additions, deletions, status, patch, file_extension
@@ -168,6 +220,16 @@ ORDER BY evaluation_timestamp DESC NULLS LAST, id DESC
 LIMIT 1
 """
 
+GET_LATEST_MINER_EVALUATIONS_FOR_MINERS = """
+SELECT DISTINCT ON (uid, hotkey)
+       id, uid, hotkey, github_id, failed_reason, total_score,
+       total_lines_changed, total_open_prs, total_prs,
+       unique_repos_count, evaluation_timestamp
+FROM miner_evaluations
+WHERE (uid, hotkey) IN %s
+ORDER BY uid, hotkey, evaluation_timestamp DESC NULLS LAST, id DESC
+"""
+
 SET_MINER_EVALUATION = """
 INSERT INTO miner_evaluations (
     uid, hotkey, github_id, failed_reason, total_score,
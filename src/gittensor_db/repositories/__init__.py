@@ -9,6 +9,8 @@ from .pull_requests_repository import PullRequestsRepository
 from .file_changes_repository import FileChangesRepository
 from .miner_evaluations_repository import MinerEvaluationsRepository
 from .issues_repository import IssuesRepository
+from .async_base_repository import AsyncBaseRepository
+from .async_miners_repository import AsyncMinersRepository
 
 __all__ = [
     'BaseRepository',
@@ -17,5 +19,7 @@ __all__ = [
     'PullRequestsRepository',
     'FileChangesRepository',
     'MinerEvaluationsRepository',
-    'IssuesRepository'
+    'IssuesRepository',
+    'AsyncBaseRepository',
+    'AsyncMinersRepository'
 ]
\ No newline at end of file
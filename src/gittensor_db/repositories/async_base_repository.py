@@ -0,0 +1,96 @@
+"""
+Async counterpart of BaseRepository built on an asyncpg connection pool.
+
+Intended for fan-out reads (e.g. looking up many miners at once), where independent
+queries run concurrently on separate pooled connections instead of one after another.
+asyncpg caches prepared statements per connection and uses the binary protocol.
+Requires the optional asyncpg dependency; create the pool with create_async_database_pool().
+"""
+
+from typing import Optional, List, Any, TypeVar, Callable
+from functools import lru_cache
+import logging
+
+from .base_repository import numbered_placeholders
+
+T = TypeVar('T')
+
+# Record supports both positional and by-name access, like the rows sync mappers receive
+Record = Any
+
+
+@lru_cache(maxsize=256)
+def _asyncpg_query(query: str) -> str:
+    """Convert a query written for psycopg2 (%s placeholders) to asyncpg's $n form"""
+    return numbered_placeholders(query)
+
+
+class AsyncBaseRepository:
+    """
+    Base class for asyncpg-backed repositories. Each call acquires its own pooled
+    connection, so calls can be awaited concurrently with asyncio.gather.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def execute_query(self, query: str, params: tuple = ()) -> List[Record]:
+        """
+        Execute a SELECT query and return results.
+
+        Args:
+            query: SQL query string using %s placeholders
+            params: Query parameters tuple
+
+        Returns:
+            List of asyncpg Records
+        """
+        async with self.pool.acquire() as connection:
+            return await connection.fetch(_asyncpg_query(query), *params)
+
+    async def execute_single_query(self, query: str, params: tuple = ()) -> Optional[Record]:
+        """
+        Execute a SELECT query and return single result.
+
+        Args:
+            query: SQL query string using %s placeholders
+            params: Query parameters tuple
+
+        Returns:
+            Single asyncpg Record or None
+        """
+        async with self.pool.acquire() as connection:
+            return await connection.fetchrow(_asyncpg_query(query), *params)
+
+    async def query_single(self, query: str, params: tuple, mapper: Callable[[Record], T]) -> Optional[T]:
+        """
+        Execute query and map single result to domain object.
+
+        Args:
+            query: SQL query string using %s placeholders
+            params: Query parameters tuple
+            mapper: Function to map the result record to domain object
+
+        Returns:
+            Mapped domain object or None
+        """
+        result = await self.execute_single_query(query, params)
+        if result:
+            return mapper(result)
+        return None
+
+    async def query_multiple(self, query: str, params: tuple, mapper: Callable[[Record], T]) -> List[T]:
+        """
+        Execute query and map multiple results to domain objects.
+
+        Args:
+            query: SQL query string using %s placeholders
+            params: Query parameters tuple
+            mapper: Function to map each result record to domain object
+
+        Returns:
+            List of mapped domain objects
+        """
+        results = await self.execute_query(query, params)
+        return [mapper(result) for result in results]
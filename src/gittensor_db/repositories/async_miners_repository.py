@@ -0,0 +1,95 @@
+"""
+Async repository for reading Miner entities through asyncpg
+"""
+import asyncio
+from typing import Optional, List, Iterable
+from ..models.domain_models import Miner
+from .async_base_repository import AsyncBaseRepository, Record
+from ..queries import (
+    GET_MINER,
+    GET_MINER_BY_UID,
+    GET_MINER_BY_HOTKEY,
+    GET_MINER_BY_GITHUB_ID,
+    GET_ALL_MINERS
+)
+
+
+class AsyncMinersRepository(AsyncBaseRepository):
+    def _map_to_miner(self, record: Record) -> Miner:
+        """Map database record to Miner object"""
+        return Miner(
+            uid=record['uid'],
+            hotkey=record['hotkey'],
+            github_id=record['github_id']
+        )
+
+    async def get_miner(self, uid: int, hotkey: str, github_id: str) -> Optional[Miner]:
+        """
+        Get a miner by their composite primary key
+
+        Args:
+            uid: Miner UID
+            hotkey: Miner hotkey
+            github_id: Miner GitHub ID
+
+        Returns:
+            Miner object if found, None otherwise
+        """
+        return await self.query_single(GET_MINER, (uid, hotkey, github_id), self._map_to_miner)
+
+    async def get_miner_by_uid(self, uid: int) -> Optional[Miner]:
+        """
+        Get a miner by UID
+
+        Args:
+            uid: Miner UID
+
+        Returns:
+            Miner object if found, None otherwise
+        """
+        return await self.query_single(GET_MINER_BY_UID, (uid,), self._map_to_miner)
+
+    async def get_miner_by_hotkey(self, hotkey: str) -> Optional[Miner]:
+        """
+        Get a miner by hotkey
+
+        Args:
+            hotkey: Miner hotkey
+
+        Returns:
+            Miner object if found, None otherwise
+        """
+        return await self.query_single(GET_MINER_BY_HOTKEY, (hotkey,), self._map_to_miner)
+
+    async def get_miner_by_github_id(self, github_id: str) -> Optional[Miner]:
+        """
+        Get a miner by GitHub ID
+
+        Args:
+            github_id: Miner GitHub ID
+
+        Returns:
+            Miner object if found, None otherwise
+        """
+        return await self.query_single(GET_MINER_BY_GITHUB_ID, (github_id,), self._map_to_miner)
+
+    async def get_all_miners(self) -> List[Miner]:
+        """
+        Get all miners
+
+        Returns:
+            List of Miner objects
+        """
+        return await self.query_multiple(GET_ALL_MINERS, (), self._map_to_miner)
+
+    async def get_many_miners(self, uids: Iterable[int]) -> List[Optional[Miner]]:
+        """
+        Look up many miners by UID concurrently, one pooled connection per lookup.
+
+        Args:
+            uids: Miner UIDs to fetch
+
+        Returns:
+            Miner (or None when not found) for each UID, in input order
+        """
+        return await asyncio.gather(*(self.get_miner_by_uid(uid) for uid in uids))
@@ -5,66 +5,372 @@ This class implements a clean abstraction layer for database operations, elimina
 redundant cursor management and error handling code across repository classes.
 """
 
-from typing import Optional, List, Dict, Any, TypeVar, Callable
+from typing import (
+    Optional, List, Dict, Any, TypeVar, Callable, Iterable, Iterator, Sequence, Union, FrozenSet
+)
 from contextlib import contextmanager
+from functools import lru_cache
+from itertools import count
+from uuid import uuid4
+from weakref import WeakKeyDictionary, WeakSet
+import io
 import logging
+import re
+import threading
+
+from psycopg2 import sql, InterfaceError
+from psycopg2.errors import InvalidSqlStatementName
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, cursor as TupleCursor
+from psycopg2.extras import execute_values
+
+try:
+    from pgcopy import CopyManager
+    PGCOPY_AVAILABLE = True
+except ImportError:
+    PGCOPY_AVAILABLE = False
 
 T = TypeVar('T')
 
+# Names of server-side prepared statements created on each raw psycopg2 connection. Keyed by
+# cursor.connection rather than the repository's connection, since pool checkouts wrap the same
+# raw connection (and server session) in a new PooledConnection every time.
+_PREPARED_STATEMENTS: 'WeakKeyDictionary[Any, set]' = WeakKeyDictionary()
+
+# Savepoint guarding prepared EXECUTEs inside a caller's transaction
+_PREPARED_SAVEPOINT = 'gittensor_prepared'
+
+# TIMESTAMP column names per table, staged as timestamptz by _copy_upsert
+_TIMESTAMP_COLUMNS: Dict[str, FrozenSet[str]] = {}
+
+# psycopg2 %s placeholders and %% escapes, rewritten by numbered_placeholders
+_PLACEHOLDER = re.compile(r'%[s%]')
+
+# Bulk writes at or above this many rows are loaded with COPY instead of multi-row INSERTs
+COPY_THRESHOLD = 1024
+
+
+@lru_cache(maxsize=256)
+def _encode_query_text(query: str) -> bytes:
+    return query.encode('utf-8')
+
+
+def _encode_query(query: Any) -> Any:
+    """
+    Encode a query string once so repeated executions hand psycopg2 ready-made bytes
+    instead of re-encoding the same text on every call. Only str queries go through
+    the cache; bytes and psycopg2.sql objects (which are not hashable) are returned
+    unchanged.
+    """
+    if isinstance(query, str):
+        return _encode_query_text(query)
+    return query
+
+
+def numbered_placeholders(query: str) -> str:
+    """
+    Rewrite psycopg2 %s placeholders to the positional $1, $2, ... form used by PREPARE and
+    asyncpg, unescaping %% to a literal % since those queries bypass psycopg2's formatting
+    """
+    positions = count(1)
+    return _PLACEHOLDER.sub(lambda match: '%' if match.group() == '%%' else f"${next(positions)}", query)
+
+
+def _copy_text_value(value: Any) -> str:
+    """Render a single value in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+class _CopyRowReader:
+    """
+    File-like object feeding rows to cursor.copy_expert in COPY text format.
+    Rows are rendered as they are read, so the full payload is never built in memory.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._lines = ('\t'.join(map(_copy_text_value, row)) + '\n' for row in rows)
+        # Unread tail of the current line; reading from a StringIO avoids re-copying
+        # a long line (e.g. a patch) on every partial read
+        self._buffer = io.StringIO()
+
+    def read(self, size: int = -1) -> str:
+        if size < 0:
+            return self._buffer.read() + ''.join(self._lines)
+        parts = [self._buffer.read(size)]
+        remaining = size - len(parts[0])
+        while remaining > 0:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer = io.StringIO(line)
+            part = self._buffer.read(remaining)
+            parts.append(part)
+            remaining -= len(part)
+        return ''.join(parts)
+
+
+class BulkWriter:
+    """
+    Buffer parameter tuples for a bulk "VALUES %s" query and write them in pages.
+
+    Everything added inside the with block is written in a single transaction that is
+    committed on a clean exit and rolled back if the block raises.
+
+    Usage:
+        with miners_repo.miner_bulk_writer() as writer:
+            for miner in miners:
+                writer.add((miner.uid, miner.hotkey, miner.github_id))
+    """
+
+    def __init__(self, repository: 'BaseRepository', query: str, page_size: int = 1000,
+                 on_commit: Optional[Callable[[], None]] = None):
+        self.repository = repository
+        self.query = query
+        self.page_size = page_size
+        self.on_commit = on_commit
+        self.written = 0
+        self._buffer: List[tuple] = []
+        self._cursor = None
+
+    def __enter__(self) -> 'BulkWriter':
+        self._cursor = self.repository.db.cursor()
+        return self
+
+    def add(self, params: tuple) -> None:
+        """Queue one row, writing the buffer once it holds page_size rows"""
+        self._buffer.append(params)
+        if len(self._buffer) >= self.page_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            execute_values(self._cursor, self.query, self._buffer, page_size=self.page_size)
+            self.written += len(self._buffer)
+            self._buffer = []
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        db = self.repository.db
+        try:
+            if exc_type is None:
+                self._flush()
+                db.commit()
+                if self.on_commit is not None:
+                    self.on_commit()
+            else:
+                db.rollback()
+        except Exception as e:
+            db.rollback()
+            self.repository.logger.error(f"Error flushing bulk writer: {e}")
+            raise
+        finally:
+            self._cursor.close()
+            self._buffer = []
+
+
 class BaseRepository:
     """
     Base repository class that handles database connections and provides
     clean query execution methods.
     """
 
-    def __init__(self, db_connection):
+    def __init__(self, db_connection, use_cache: bool = False):
         self.db = db_connection
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Gates @ttl_cached getters; cached reads can go stale if other processes write
+        # to the same tables
+        self.use_cache = use_cache
+        # Cursors are reused across queries, one per thread and row type
+        self._local = threading.local()
+        # Weak so cursors of finished threads, or replaced after a reconnect, can be freed
+        self._open_cursors: 'WeakSet[Any]' = WeakSet()
+        self._cursors_lock = threading.Lock()
+
+    def _cursor(self, tuple_rows: bool = False, **kwargs):
+        """Open a cursor returning plain tuples when tuple_rows is set, else the connection's dict rows"""
+        if tuple_rows:
+            kwargs['cursor_factory'] = TupleCursor
+        return self.db.cursor(**kwargs)
+
+    def _thread_cursor(self, tuple_rows: bool):
+        """Get this thread's reusable cursor, opening a new one if it was closed or the connection was released"""
+        cursors = self._local.__dict__.setdefault('cursors', {})
+        cursor = cursors.get(tuple_rows)
+        if cursor is None or cursor.closed or self.db.closed:
+            cursor = self._cursor(tuple_rows)
+            cursors[tuple_rows] = cursor
+            with self._cursors_lock:
+                self._open_cursors.add(cursor)
+        return cursor
 
     @contextmanager
-    def get_cursor(self):
+    def get_cursor(self, tuple_rows: bool = False):
         """
         Context manager for database cursor operations.
-        Automatically handles cursor cleanup.
+        Yields a cursor reused by every query this thread runs through the repository;
+        it stays open until close() is called.
+
+        Args:
+            tuple_rows: Return rows as plain tuples in SELECT column order instead of dictionaries
         """
-        cursor = self.db.cursor()
+        cursor = self._thread_cursor(tuple_rows)
         try:
             yield cursor
-        finally:
-            cursor.close()
+        except InterfaceError:
+            # Cursor or connection went away underneath us; open a fresh cursor next time.
+            # A reconnect is a new raw connection, so its prepared statements are re-checked.
+            self._local.cursors.pop(tuple_rows, None)
+            raise
+
+    def close(self) -> None:
+        """Close every cursor this repository opened. Call before closing or releasing its connection."""
+        with self._cursors_lock:
+            cursors, self._open_cursors = list(self._open_cursors), WeakSet()
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._local = threading.local()
 
-    def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    def execute_query(self, query: str, params: tuple = (), tuple_rows: bool = False) -> List[Dict[str, Any]]:
         """
         Execute a SELECT query and return results.
 
         Args:
             query: SQL query string
             params: Query parameters tuple
-            dictionary: Whether to return dictionary results
+            tuple_rows: Return plain tuples instead of dictionaries
 
         Returns:
             List of result dictionaries
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(query, params)
+        with self.get_cursor(tuple_rows) as cursor:
+            cursor.execute(_encode_query(query), params)
             return cursor.fetchall()
 
-    def execute_single_query(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+    def execute_query_iter(self, query: str, params: tuple = (), itersize: int = 2000,
+                           tuple_rows: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query and stream results through a server-side (named) cursor.
+
+        Rows are fetched from the server itersize at a time, so memory stays constant
+        regardless of result size. Must be consumed inside a transaction.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            itersize: Rows fetched per network round-trip
+            tuple_rows: Yield plain tuples instead of dictionaries
+
+        Yields:
+            Result dictionaries
+        """
+        cursor = self._cursor(tuple_rows, name=f"ss_{uuid4().hex}")
+        try:
+            cursor.itersize = itersize
+            cursor.execute(_encode_query(query), params)
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def execute_single_query(self, query: str, params: tuple = (), tuple_rows: bool = False) -> Optional[Dict[str, Any]]:
         """
         Execute a SELECT query and return single result.
 
         Args:
             query: SQL query string
             params: Query parameters tuple
-            dictionary: Whether to return dictionary result
+            tuple_rows: Return a plain tuple instead of a dictionary
 
         Returns:
             Single result dictionary or None
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(query, params)
+        with self.get_cursor(tuple_rows) as cursor:
+            cursor.execute(_encode_query(query), params)
             return cursor.fetchone()
 
+    def _ensure_prepared(self, cursor, name: str, query: str) -> None:
+        """
+        PREPARE a query on the current connection unless it already is.
+
+        Prepared statements live as long as the server session, which may outlive this
+        repository (pooled connections), so the first use per connection checks
+        pg_prepared_statements before issuing PREPARE.
+        """
+        prepared = _PREPARED_STATEMENTS.setdefault(cursor.connection, set())
+        if name in prepared:
+            return
+
+        cursor.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+        if cursor.fetchone() is None:
+            cursor.execute(f"PREPARE {name} AS {numbered_placeholders(query)}")
+        prepared.add(name)
+
+    def _execute_prepared_on(self, cursor, name: str, query: str, params: tuple) -> None:
+        """
+        Run a prepared statement on cursor, preparing it first if needed.
+
+        If the statement was deallocated behind our back (e.g. DISCARD ALL from a
+        connection pooler, or a failover), it is prepared again and retried once. When
+        a transaction is already open the EXECUTE runs under a savepoint, so the retry
+        rolls back only the failed EXECUTE and keeps the caller's transaction usable;
+        this costs one extra round trip to release the savepoint.
+        """
+        idle = self.db.info.transaction_status == TRANSACTION_STATUS_IDLE
+        self._ensure_prepared(cursor, name, query)
+        if params:
+            statement = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+        else:
+            statement = f"EXECUTE {name}"
+
+        if idle:
+            # The transaction is ours, so a failed attempt can simply be rolled back
+            try:
+                cursor.execute(statement, params)
+            except InvalidSqlStatementName:
+                _PREPARED_STATEMENTS.get(cursor.connection, set()).discard(name)
+                self.db.rollback()
+                self._ensure_prepared(cursor, name, query)
+                cursor.execute(statement, params)
+            return
+
+        # SAVEPOINT is sent in the same round trip; the cursor keeps the EXECUTE results
+        try:
+            cursor.execute(f"SAVEPOINT {_PREPARED_SAVEPOINT}; {statement}", params)
+        except InvalidSqlStatementName:
+            _PREPARED_STATEMENTS.get(cursor.connection, set()).discard(name)
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {_PREPARED_SAVEPOINT}")
+            self._ensure_prepared(cursor, name, query)
+            cursor.execute(statement, params)
+        # Released on a separate cursor so the results stay on cursor for the caller
+        with self._cursor(tuple_rows=True) as release_cursor:
+            release_cursor.execute(f"RELEASE SAVEPOINT {_PREPARED_SAVEPOINT}")
+
+    def execute_prepared(self, name: str, query: str, params: tuple = (), tuple_rows: bool = False) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query through a named server-side prepared statement.
+
+        The query is parsed and planned once per connection; later calls only send
+        EXECUTE with the parameters.
+
+        Args:
+            name: Prepared statement name, unique per query
+            query: SQL query string using %s placeholders
+            params: Query parameters tuple
+            tuple_rows: Return plain tuples instead of dictionaries
+
+        Returns:
+            List of result dictionaries
+        """
+        with self.get_cursor(tuple_rows) as cursor:
+            self._execute_prepared_on(cursor, name, query, params)
+            return cursor.fetchall()
+
     def execute_command(self, query: str, params: tuple = ()) -> bool:
         """
         Execute an INSERT, UPDATE, or DELETE command.
@@ -78,7 +384,7 @@ class BaseRepository:
         """
         try:
             with self.get_cursor() as cursor:
-                cursor.execute(query, params)
+                cursor.execute(_encode_query(query), params)
                 self.db.commit()
                 return True
         except Exception as e:
@@ -86,7 +392,113 @@ class BaseRepository:
             self.logger.error(f"Error executing command: {e}")
             return False
 
-    def query_single(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T]) -> Optional[T]:
+    def execute_command_returning(self, query: str, params: tuple = (), tuple_rows: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Execute an INSERT/UPDATE ... RETURNING command and return the row it produced.
+        Saves the extra round-trip of reading a row back right after writing it.
+
+        Args:
+            query: SQL command string with a RETURNING clause
+            params: Query parameters tuple
+            tuple_rows: Return a plain tuple instead of a dictionary
+
+        Returns:
+            Returned row if successful, None otherwise
+        """
+        try:
+            with self.get_cursor(tuple_rows) as cursor:
+                cursor.execute(_encode_query(query), params)
+                result = cursor.fetchone()
+                self.db.commit()
+                return result
+        except Exception as e:
+            self.db.rollback()
+            self.logger.error(f"Error executing command: {e}")
+            return None
+
+    def _relax_commit_durability(self, cursor) -> None:
+        """
+        Let a bulk-ingest transaction commit without waiting for its WAL flush.
+
+        Ingest is replayable from GitHub, so a database crash may lose the last few
+        moments of committed batches (never corrupt them) and callers re-run ingestion.
+        SET LOCAL lasts until the transaction ends, so it is only applied when the
+        connection is idle on entry: the bulk store then owns the transaction, and
+        unrelated writes the caller still has pending keep full durability.
+        """
+        if self.db.info.transaction_status == TRANSACTION_STATUS_IDLE:
+            cursor.execute("SET LOCAL synchronous_commit TO off")
+
+    def _timestamp_columns(self, table: str) -> FrozenSet[str]:
+        """Names of a table's TIMESTAMP (without time zone) columns, looked up once per process"""
+        columns = _TIMESTAMP_COLUMNS.get(table)
+        if columns is None:
+            with self._cursor(tuple_rows=True) as catalog_cursor:
+                catalog_cursor.execute(
+                    "SELECT attname FROM pg_attribute "
+                    "WHERE attrelid = %s::regclass AND atttypid = 'timestamp'::regtype AND NOT attisdropped",
+                    (table,)
+                )
+                columns = frozenset(name for name, in catalog_cursor.fetchall())
+            _TIMESTAMP_COLUMNS[table] = columns
+        return columns
+
+    def _copy_upsert(self, cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]], upsert_query: str,
+                     binary: bool = False) -> None:
+        """
+        Bulk load rows with COPY into a temporary staging table, then upsert them into the target.
+
+        The conflict handling is taken from upsert_query, a bulk upsert of the form
+        "INSERT INTO table (columns) VALUES %s ON CONFLICT ...", so both load paths
+        resolve conflicts identically. Runs in the caller's transaction; each call stages
+        into its own uniquely named table, dropped once the upsert has run, so several
+        COPY loads can share one transaction.
+
+        Args:
+            cursor: Cursor of the caller's transaction
+            table: Target table name
+            columns: Column names matching the order of values in each row
+            rows: Row value tuples
+            upsert_query: Bulk upsert query whose VALUES %s is replaced by the staging SELECT
+            binary: Load with pgcopy's binary COPY format when it is installed, skipping text escaping and parsing
+        """
+        staging_name = f"staging_{table}_{uuid4().hex}"
+        staging = sql.Identifier(staging_name)
+        column_list = sql.SQL(', ').join(sql.Identifier(column) for column in columns)
+
+        # TIMESTAMP columns are staged as timestamptz: TIMESTAMP input silently drops a UTC
+        # offset, while execute_values sends aware datetimes as timestamptz, which the
+        # upsert converts with the session TimeZone. Staging as timestamptz makes the
+        # INSERT ... SELECT apply that same conversion, so both load paths store equal values.
+        timestamp_columns = self._timestamp_columns(table)
+        staged_columns = sql.SQL(', ').join(
+            sql.SQL("{0}::timestamptz AS {0}").format(sql.Identifier(column)) if column in timestamp_columns
+            else sql.Identifier(column)
+            for column in columns
+        )
+
+        # Column types only: no defaults (avoids burning sequence values) and no constraints
+        cursor.execute(sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+            staging, staged_columns, sql.Identifier(table)
+        ))
+        if binary and PGCOPY_AVAILABLE:
+            # pgcopy resolves the schema with tuple indexing, so look up the temp schema ourselves
+            with self._cursor(tuple_rows=True) as schema_cursor:
+                schema_cursor.execute("SELECT nspname FROM pg_namespace WHERE oid = pg_my_temp_schema()")
+                temp_schema = schema_cursor.fetchone()[0]
+            CopyManager(self.db, f"{temp_schema}.{staging_name}", list(columns)).copy(rows)
+        else:
+            cursor.copy_expert(
+                sql.SQL("COPY {} ({}) FROM STDIN").format(staging, column_list).as_string(cursor),
+                _CopyRowReader(rows)
+            )
+        select = sql.SQL("SELECT {} FROM {}").format(column_list, staging).as_string(cursor)
+        # ON COMMIT DROP still covers a failed upsert; on success drop it in the same round trip
+        drop = sql.SQL("DROP TABLE {}").format(staging).as_string(cursor)
+        cursor.execute(f"{upsert_query.replace('VALUES %s', select)}; {drop}")
+
+    def query_single(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T],
+                     tuple_rows: bool = False) -> Optional[T]:
         """
         Execute query and map single result to domain object.
 
@@ -94,16 +506,38 @@ class BaseRepository:
             query: SQL query string
             params: Query parameters tuple
             mapper: Function to map result dict to domain object
+            tuple_rows: Hand the mapper a plain tuple in SELECT column order instead of a dict
 
         Returns:
             Mapped domain object or None
         """
-        result = self.execute_single_query(query, params)
+        result = self.execute_single_query(query, params, tuple_rows)
         if result:
             return mapper(result)
         return None
 
-    def query_multiple(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T]) -> List[T]:
+    def query_single_prepared(self, name: str, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T],
+                              tuple_rows: bool = False) -> Optional[T]:
+        """
+        Execute query as a prepared statement and map single result to domain object.
+
+        Args:
+            name: Prepared statement name, unique per query
+            query: SQL query string
+            params: Query parameters tuple
+            mapper: Function to map result dict to domain object
+            tuple_rows: Hand the mapper a plain tuple in SELECT column order instead of a dict
+
+        Returns:
+            Mapped domain object or None
+        """
+        results = self.execute_prepared(name, query, params, tuple_rows)
+        if results:
+            return mapper(results[0])
+        return None
+
+    def query_multiple(self, query: str, params: tuple, mapper: Callable[[Dict[str, Any]], T],
+                       stream: bool = False, tuple_rows: bool = False) -> Union[List[T], Iterator[T]]:
         """
         Execute query and map multiple results to domain objects.
 
@@ -111,13 +545,61 @@ class BaseRepository:
             query: SQL query string
             params: Query parameters tuple
             mapper: Function to map result dict to domain object
+            stream: Lazily yield mapped objects from a server-side cursor instead of building a list
+            tuple_rows: Hand the mapper plain tuples in SELECT column order instead of dicts
 
         Returns:
-            List of mapped domain objects
+            List of mapped domain objects, or an iterator of them when streaming
         """
-        results = self.execute_query(query, params)
+        if stream:
+            return (mapper(result) for result in self.execute_query_iter(query, params, tuple_rows=tuple_rows))
+
+        results = self.execute_query(query, params, tuple_rows)
         return [mapper(result) for result in results]
 
+    def bulk_writer(self, query: str, page_size: int = 1000,
+                    on_commit: Optional[Callable[[], None]] = None) -> BulkWriter:
+        """
+        Create a BulkWriter that buffers rows for a bulk "VALUES %s" query.
+
+        Args:
+            query: Bulk INSERT/upsert query with a single VALUES %s placeholder
+            page_size: Rows buffered before each write
+            on_commit: Called after the writer's transaction commits, e.g. to invalidate caches
+
+        Returns:
+            BulkWriter to use as a context manager
+        """
+        return BulkWriter(self, query, page_size, on_commit)
+
+    def query_multiple_indexed(self, query: str, params: tuple,
+                               mapper_factory: Callable[[Dict[str, int]], Callable[[tuple], T]],
+                               prepared: Optional[str] = None) -> List[T]:
+        """
+        Execute query on a tuple cursor and map results with a mapper built once per query.
+
+        The factory receives each column's position from cursor.description, so the
+        returned mapper reads fields by index instead of hashing column names per row.
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            mapper_factory: Function taking {column name: position} and returning a row tuple mapper
+            prepared: Run the query as a server-side prepared statement of this name
+
+        Returns:
+            List of mapped domain objects
+        """
+        with self.get_cursor(tuple_rows=True) as cursor:
+            if prepared:
+                self._execute_prepared_on(cursor, prepared, query, params)
+            else:
+                cursor.execute(_encode_query(query), params)
+            columns = {column.name: position for position, column in enumerate(cursor.description)}
+            rows = cursor.fetchall()
+        mapper = mapper_factory(columns)
+        return [mapper(row) for row in rows]
+
     def set_entity(self, query: str, params: tuple) -> bool:
         """
         Insert or update an entity using the provided query.
@@ -0,0 +1,241 @@
+"""
+Process-wide TTL cache for slowly changing lookups, optionally shared through Redis.
+
+The hot tier is an in-process LRU whose entries expire after ttl seconds. When
+REDIS_URL is set and the redis package is installed, local misses fall through to
+Redis so processes share results and see each other's invalidations.
+
+Keys are scoped to the database a repository is connected to, and callers always
+get their own copies of cached objects.
+"""
+import os
+import copy
+import json
+import inspect
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from functools import lru_cache, wraps
+from typing import Any, Dict, Hashable, Iterable, Tuple
+from weakref import WeakKeyDictionary
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Returned by TTLCache.get on a miss, since None is a valid cached value
+MISSING = object()
+
+# Database identity per connection, see database_key()
+_DATABASE_KEYS: 'WeakKeyDictionary[Any, str]' = WeakKeyDictionary()
+
+
+def database_key(connection) -> str:
+    """
+    Identify the database a connection points at, so cache entries for one database
+    are never served to repositories connected to another.
+
+    Returns:
+        "host:port/dbname" for psycopg2 connections, a per-object fallback otherwise
+    """
+    key = _DATABASE_KEYS.get(connection)
+    if key is None:
+        try:
+            info = connection.info
+            key = f"{info.host}:{info.port}/{info.dbname}"
+        except Exception:
+            key = f"connection-{id(connection)}"
+        _DATABASE_KEYS[connection] = key
+    return key
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy a cached value (a domain object or a list of them) so callers cannot mutate the cache"""
+    if isinstance(value, list):
+        return [copy.copy(item) for item in value]
+    return copy.copy(value)
+
+
+@lru_cache(maxsize=1)
+def _redis_client():
+    """
+    Shared Redis client built from REDIS_URL once per process.
+    Call _redis_client.cache_clear() to pick up a changed environment.
+
+    Returns:
+        redis.Redis instance, or None when Redis is not installed or not configured
+    """
+    url = os.getenv('REDIS_URL')
+    if not REDIS_AVAILABLE or not url:
+        return None
+    return redis.Redis(connection_pool=redis.ConnectionPool.from_url(url))
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and an optional Redis tier.
+
+    Values are domain dataclasses (or lists of them) stored and returned as copies.
+    The Redis tier serializes them as JSON and only rebuilds the dataclass types
+    passed in types, so nothing read back from Redis is ever unpickled or executed.
+    Redis failures are logged and treated as misses so lookups fall back to the database.
+    """
+
+    def __init__(self, namespace: str, ttl: float = 60, maxsize: int = 4096, types: Iterable[type] = ()):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._types: Dict[str, type] = {cls.__name__: cls for cls in types}
+        self._entries: 'OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _encode(self, value: Any) -> Any:
+        """Convert a value to JSON-compatible data, tagging registered dataclasses with their type"""
+        if isinstance(value, list):
+            return [self._encode(item) for item in value]
+        if is_dataclass(value):
+            name = type(value).__name__
+            if self._types.get(name) is not type(value):
+                raise TypeError(f"{name} is not registered with cache '{self.namespace}'")
+            return {'__type__': name,
+                    'fields': {f.name: getattr(value, f.name) for f in fields(value) if f.init}}
+        return value
+
+    def _decode(self, data: Any) -> Any:
+        """Rebuild a value produced by _encode, refusing types not registered with this cache"""
+        if isinstance(data, list):
+            return [self._decode(item) for item in data]
+        if isinstance(data, dict):
+            cls = self._types.get(data.get('__type__'))
+            if cls is None:
+                raise ValueError(f"unexpected cached type in cache '{self.namespace}'")
+            return cls(**data['fields'])
+        return data
+
+    def dumps(self, value: Any) -> str:
+        """Serialize a value for the Redis tier"""
+        return json.dumps(self._encode(value))
+
+    def loads(self, payload: Any) -> Any:
+        """Deserialize a value read from the Redis tier"""
+        return self._decode(json.loads(payload))
+
+    def _redis_key(self, key: Tuple[Hashable, ...]) -> str:
+        return f"gittensor_db:{self.namespace}:" + ':'.join(map(str, key))
+
+    def _store_local(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Any:
+        """
+        Look up a key in the local tier, then Redis.
+
+        Returns:
+            Cached value, or MISSING if neither tier holds a live entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return _copy_value(entry[1])
+                del self._entries[key]
+
+        client = _redis_client()
+        if client is not None:
+            try:
+                payload = client.get(self._redis_key(key))
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache read failed: {e}")
+                payload = None
+            if payload is not None:
+                try:
+                    value = self.loads(payload)
+                except (ValueError, TypeError, KeyError) as e:
+                    logger.warning(f"Ignoring unreadable Redis cache entry: {e}")
+                    return MISSING
+                self._store_local(key, value)
+                return _copy_value(value)
+        return MISSING
+
+    def set(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Store a copy of a value in both tiers"""
+        self._store_local(key, _copy_value(value))
+        client = _redis_client()
+        if client is not None:
+            try:
+                client.set(self._redis_key(key), self.dumps(value), ex=max(1, int(self.ttl)))
+            except TypeError as e:
+                logger.warning(f"Value not cached in Redis: {e}")
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache write failed: {e}")
+
+    def delete(self, *keys: Tuple[Hashable, ...]) -> None:
+        """Invalidate keys in both tiers"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        client = _redis_client()
+        if client is not None and keys:
+            try:
+                client.delete(*(self._redis_key(key) for key in keys))
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache delete failed: {e}")
+
+    def clear(self) -> None:
+        """Invalidate every entry in this cache's namespace in both tiers"""
+        with self._lock:
+            self._entries.clear()
+        client = _redis_client()
+        if client is not None:
+            try:
+                keys = list(client.scan_iter(match=f"gittensor_db:{self.namespace}:*"))
+                if keys:
+                    client.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Redis cache clear failed: {e}")
+
+
+def ttl_cached(cache: TTLCache, name: str):
+    """
+    Memoize a repository getter in a process-wide TTLCache.
+
+    Only repositories created with use_cache=True read or fill the cache; others go
+    straight to the database. Results are keyed by (database_key(self.db), name, *args).
+    None results (not found) are not cached, so a newly written row is visible on the
+    next lookup. Writers invalidate stale keys with cache.delete() or cache.clear().
+
+    Args:
+        cache: Cache shared by the repository's getters
+        name: Key prefix for the decorated getter
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.use_cache:
+                return method(self, *args, **kwargs)
+            if kwargs:
+                # Normalize keyword calls so they share keys with positional calls
+                args = tuple(signature.bind(self, *args, **kwargs).arguments.values())[1:]
+            key = (database_key(self.db), name) + args
+            value = cache.get(key)
+            if value is not MISSING:
+                return value
+            value = method(self, *args)
+            if value is not None:
+                cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
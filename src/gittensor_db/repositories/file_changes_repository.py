@@ -1,35 +1,50 @@
 """
 Repository for handling database operations for FileChange entities
 """
-from typing import Optional, List, Dict, Any
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from psycopg2.extras import execute_values
 from ..models.domain_models import FileChange
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, COPY_THRESHOLD
 from ..queries import (
     GET_FILE_CHANGE,
     GET_FILE_CHANGES_BY_PR,
-    SET_FILE_CHANGES_FOR_PR,
+    GET_FILE_CHANGES_FOR_PRS,
     BULK_UPSERT_FILE_CHANGES
 )
 
 
+# Column order of the bulk upsert value tuples
+_FILE_CHANGE_COLUMNS = ('pr_number', 'repository_full_name', 'filename', 'changes', 'additions', 'deletions', 'status', 'patch', 'file_extension')
+
+# Columns read from file change SELECT results, in the order the mapper unpacks them
+_FILE_CHANGE_FIELDS = ('id',) + _FILE_CHANGE_COLUMNS
+
+
 class FileChangesRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
-    def _map_to_file_change(self, row: Dict[str, Any]) -> FileChange:
-        """Map database row to FileChange object"""
-        return FileChange(
-            pr_number=row['pr_number'],
-            repository_full_name=row['repository_full_name'],
-            filename=row['filename'],
-            changes=row['changes'],
-            additions=row['additions'],
-            deletions=row['deletions'],
-            status=row['status'],
-            patch=row['patch'],
-            file_extension=row.get('file_extension'),
-            id=row.get('id')
-        )
+    def _file_change_mapper(self, columns: Dict[str, int]) -> Callable[[Tuple[Any, ...]], FileChange]:
+        """Build a mapper from database row tuples to FileChange objects for the given column positions"""
+        fields = itemgetter(*(columns[name] for name in _FILE_CHANGE_FIELDS))
+
+        def map_to_file_change(row: Tuple[Any, ...]) -> FileChange:
+            (file_change_id, pr_number, repository_full_name, filename, changes, additions,
+             deletions, status, patch, file_extension) = fields(row)
+            return FileChange(
+                pr_number=pr_number,
+                repository_full_name=repository_full_name,
+                filename=filename,
+                changes=changes,
+                additions=additions,
+                deletions=deletions,
+                status=status,
+                patch=patch,
+                file_extension=file_extension,
+                id=file_change_id
+            )
+        return map_to_file_change
 
     def get_file_change(self, file_change_id: int) -> Optional[FileChange]:
         """
@@ -41,7 +56,8 @@ class FileChangesRepository(BaseRepository):
         Returns:
             FileChange object if found, None otherwise
         """
-        return self.query_single(GET_FILE_CHANGE, (file_change_id,), self._map_to_file_change)
+        results = self.query_multiple_indexed(GET_FILE_CHANGE, (file_change_id,), self._file_change_mapper)
+        return results[0] if results else None
 
     def get_file_changes_by_pr(self, pr_number: int, repository_full_name: str) -> List[FileChange]:
         """
@@ -54,7 +70,28 @@ class FileChangesRepository(BaseRepository):
         Returns:
             List of FileChange objects
         """
-        return self.query_multiple(GET_FILE_CHANGES_BY_PR, (pr_number, repository_full_name), self._map_to_file_change)
+        return self.query_multiple_indexed(GET_FILE_CHANGES_BY_PR, (pr_number, repository_full_name), self._file_change_mapper)
+
+    def get_file_changes_for_prs(self, pr_keys: List[Tuple[int, str]]) -> Dict[Tuple[int, str], List[FileChange]]:
+        """
+        Get file changes for many pull requests in a single query.
+
+        Use this instead of calling get_file_changes_by_pr once per PR.
+
+        Args:
+            pr_keys: List of (pr_number, repository_full_name) tuples
+
+        Returns:
+            Dict mapping each requested (pr_number, repository_full_name) to its FileChange objects
+        """
+        file_changes_by_pr: Dict[Tuple[int, str], List[FileChange]] = {tuple(key): [] for key in pr_keys}
+        if not file_changes_by_pr:
+            return file_changes_by_pr
+
+        file_changes = self.query_multiple_indexed(GET_FILE_CHANGES_FOR_PRS, (tuple(file_changes_by_pr),), self._file_change_mapper)
+        for file_change in file_changes:
+            file_changes_by_pr[(file_change.pr_number, file_change.repository_full_name)].append(file_change)
+        return file_changes_by_pr
 
     def set_file_changes_for_pr(self, pr_number: int, repository_full_name: str, file_changes: List[FileChange]) -> bool:
         """
@@ -74,24 +111,25 @@ class FileChangesRepository(BaseRepository):
         if not file_changes:
             return True
 
-        query = SET_FILE_CHANGES_FOR_PR
+        values = [
+            (
+                pr_number,
+                repository_full_name,
+                file_change.filename,
+                file_change.changes,
+                file_change.additions,
+                file_change.deletions,
+                file_change.status,
+                file_change.patch,
+                file_change.file_extension  # Filled in by FileChange.__post_init__
+            )
+            for file_change in file_changes
+        ]
 
         try:
             with self.get_cursor() as cursor:
-                for file_change in file_changes:
-                    params = (
-                        pr_number,
-                        repository_full_name,
-                        file_change.filename,
-                        file_change.changes,
-                        file_change.additions,
-                        file_change.deletions,
-                        file_change.status,
-                        file_change.patch,
-                        file_change.file_extension or file_change._calculate_file_extension()
-                    )
-                    cursor.execute(query, params)
-
+                # One multi-row INSERT per page instead of a statement per file
+                execute_values(cursor, BULK_UPSERT_FILE_CHANGES, values, page_size=500)
                 self.db.commit()
                 return True
         except Exception as e:
@@ -126,10 +164,9 @@ class FileChangesRepository(BaseRepository):
         if not file_changes:
             return 0
 
-        # Prepare data for bulk insert
-        values = []
-        for file_change in file_changes:
-            values.append((
+        # Rows are generated lazily so large patch payloads are never held twice
+        values = (
+            (
                 file_change.pr_number,
                 file_change.repository_full_name,
                 file_change.filename,
@@ -138,22 +175,30 @@ class FileChangesRepository(BaseRepository):
                 file_change.deletions,
                 file_change.status,
                 file_change.patch,
-                file_change.file_extension or file_change._calculate_file_extension()
-            ))
+                file_change.file_extension  # Filled in by FileChange.__post_init__
+            )
+            for file_change in file_changes
+        )
 
         try:
             with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_FILE_CHANGES.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
+                self._relax_commit_durability(cursor)
+                if len(file_changes) >= COPY_THRESHOLD:
+                    # COPY through a staging table is the fastest ingest path for large batches;
+                    # binary format (pgcopy) avoids escaping and re-parsing multi-KB patches
+                    self._copy_upsert(cursor, 'file_changes', _FILE_CHANGE_COLUMNS, values, BULK_UPSERT_FILE_CHANGES,
+                                      binary=True)
+                else:
+                    # Use psycopg2's execute_values for efficient bulk insert
+                    execute_values(
+                        cursor,
+                        BULK_UPSERT_FILE_CHANGES,
+                        values,
+                        template=None,
+                        page_size=1000
+                    )
                 self.db.commit()
-                return len(values)
+                return len(file_changes)
         except Exception as e:
             self.db.rollback()
             self.logger.error(f"Error in bulk file change storage: {e}")
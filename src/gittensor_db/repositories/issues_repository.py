@@ -1,9 +1,10 @@
 """
 Repository for handling database operations for Issue entities
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Any, Tuple
+from psycopg2.extras import execute_values
 from ..models.domain_models import Issue
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, COPY_THRESHOLD
 from ..queries import (
     GET_ISSUE,
     GET_ISSUES_BY_REPOSITORY,
@@ -12,19 +13,24 @@ from ..queries import (
 )
 
 
+# Column order of the bulk upsert value tuples
+_ISSUE_COLUMNS = ('number', 'pr_number', 'repository_full_name', 'title', 'created_at', 'closed_at')
+
+
 class IssuesRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
-    def _map_to_issue(self, row: Dict[str, Any]) -> Issue:
-        """Map database row to Issue object"""
+    def _map_to_issue(self, row: Tuple[Any, ...]) -> Issue:
+        """Map a database row tuple in issue SELECT column order to Issue object"""
+        number, pr_number, repository_full_name, title, created_at, closed_at = row
         return Issue(
-            number=row['number'],
-            pr_number=row['pr_number'],
-            repository_full_name=row['repository_full_name'],
-            title=row['title'],
-            created_at=row['created_at'],
-            closed_at=row['closed_at']
+            number=number,
+            pr_number=pr_number,
+            repository_full_name=repository_full_name,
+            title=title,
+            created_at=created_at,
+            closed_at=closed_at
         )
 
     def get_issue(self, number: int, repository_full_name: str) -> Optional[Issue]:
@@ -38,7 +44,7 @@ class IssuesRepository(BaseRepository):
         Returns:
             Issue object if found, None otherwise
         """
-        return self.query_single(GET_ISSUE, (number, repository_full_name), self._map_to_issue)
+        return self.query_single(GET_ISSUE, (number, repository_full_name), self._map_to_issue, tuple_rows=True)
 
     def get_issues_by_repository(self, repository_full_name: str) -> List[Issue]:
         """
@@ -50,7 +56,7 @@ class IssuesRepository(BaseRepository):
         Returns:
             List of Issue objects
         """
-        return self.query_multiple(GET_ISSUES_BY_REPOSITORY, (repository_full_name,), self._map_to_issue)
+        return self.query_multiple(GET_ISSUES_BY_REPOSITORY, (repository_full_name,), self._map_to_issue, tuple_rows=True)
 
     def set_issue(self, issue: Issue) -> bool:
         """
@@ -99,15 +105,19 @@ class IssuesRepository(BaseRepository):
 
         try:
             with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_ISSUES.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
+                self._relax_commit_durability(cursor)
+                if len(values) >= COPY_THRESHOLD:
+                    # COPY through a staging table is the fastest ingest path for large batches
+                    self._copy_upsert(cursor, 'issues', _ISSUE_COLUMNS, values, BULK_UPSERT_ISSUES)
+                else:
+                    # Use psycopg2's execute_values for efficient bulk insert
+                    execute_values(
+                        cursor,
+                        BULK_UPSERT_ISSUES,
+                        values,
+                        template=None,
+                        page_size=1000
+                    )
                 self.db.commit()
                 return len(values)
         except Exception as e:
@@ -1,13 +1,14 @@
 """
 Repository for handling database operations for MinerEvaluation entities
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union
 from datetime import datetime
 from ..models.domain_models import MinerEvaluation
 from .base_repository import BaseRepository
 from ..queries import (
     GET_MINER_EVALUATION,
     GET_LATEST_MINER_EVALUATION,
+    GET_LATEST_MINER_EVALUATIONS_FOR_MINERS,
     SET_MINER_EVALUATION,
     GET_EVALUATIONS_BY_TIMEFRAME
 )
@@ -16,20 +17,22 @@ class MinerEvaluationsRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
 
-    def _map_to_miner_evaluation(self, row: Dict[str, Any]) -> MinerEvaluation:
-        """Map database row to MinerEvaluation object"""
+    def _map_to_miner_evaluation(self, row: Tuple[Any, ...]) -> MinerEvaluation:
+        """Map a database row tuple in miner evaluation SELECT column order to MinerEvaluation object"""
+        (evaluation_id, uid, hotkey, github_id, failed_reason, total_score, total_lines_changed,
+         total_open_prs, total_prs, unique_repos_count, evaluation_timestamp) = row
         return MinerEvaluation(
-            uid=row['uid'],
-            hotkey=row['hotkey'],  # Required field
-            id=row['id'],  # Required field
-            total_score=float(row['total_score']) if row['total_score'] is not None else 0.0,
-            total_lines_changed=row['total_lines_changed'] or 0,
-            total_open_prs=row['total_open_prs'] or 0,
-            unique_repos_count=row['unique_repos_count'] or 0,
-            github_id=row['github_id'],  # Optional
-            failed_reason=row['failed_reason'],  # Optional
-            evaluation_timestamp=row['evaluation_timestamp'],  # Optional
-            stored_total_prs=row['total_prs'] if 'total_prs' in row else None  # Map DB total_prs
+            uid=uid,
+            hotkey=hotkey,  # Required field
+            id=evaluation_id,  # Required field
+            total_score=float(total_score) if total_score is not None else 0.0,
+            total_lines_changed=total_lines_changed or 0,
+            total_open_prs=total_open_prs or 0,
+            unique_repos_count=unique_repos_count or 0,
+            github_id=github_id,  # Optional
+            failed_reason=failed_reason,  # Optional
+            evaluation_timestamp=evaluation_timestamp,  # Optional
+            stored_total_prs=total_prs  # Map DB total_prs
         )
 
     def get_miner_evaluation(self, evaluation_id: int) -> Optional[MinerEvaluation]:
@@ -42,7 +45,7 @@ class MinerEvaluationsRepository(BaseRepository):
         Returns:
             MinerEvaluation object if found, None otherwise
         """
-        return self.query_single(GET_MINER_EVALUATION, (evaluation_id,), self._map_to_miner_evaluation)
+        return self.query_single(GET_MINER_EVALUATION, (evaluation_id,), self._map_to_miner_evaluation, tuple_rows=True)
 
     def get_latest_miner_evaluation(self, uid: int, hotkey: str) -> Optional[MinerEvaluation]:
         """
@@ -55,7 +58,26 @@ class MinerEvaluationsRepository(BaseRepository):
         Returns:
             Latest MinerEvaluation object if found, None otherwise
         """
-        return self.query_single(GET_LATEST_MINER_EVALUATION, (uid, hotkey), self._map_to_miner_evaluation)
+        return self.query_single(GET_LATEST_MINER_EVALUATION, (uid, hotkey), self._map_to_miner_evaluation, tuple_rows=True)
+
+    def get_latest_miner_evaluations_for(self, uids_hotkeys: List[Tuple[int, str]]) -> Dict[Tuple[int, str], MinerEvaluation]:
+        """
+        Get the latest evaluation for many miners in a single query.
+
+        Use this instead of calling get_latest_miner_evaluation once per miner.
+
+        Args:
+            uids_hotkeys: List of (uid, hotkey) tuples
+
+        Returns:
+            Dict mapping (uid, hotkey) to its latest MinerEvaluation; miners without evaluations are absent
+        """
+        keys = tuple(dict.fromkeys(tuple(key) for key in uids_hotkeys))
+        if not keys:
+            return {}
+
+        evaluations = self.query_multiple(GET_LATEST_MINER_EVALUATIONS_FOR_MINERS, (keys,), self._map_to_miner_evaluation, tuple_rows=True)
+        return {(evaluation.uid, evaluation.hotkey): evaluation for evaluation in evaluations}
 
     def set_miner_evaluation(self, evaluation: MinerEvaluation) -> bool:
         """
@@ -81,15 +103,18 @@ class MinerEvaluationsRepository(BaseRepository):
         )
         return self.set_entity(query, params)
 
-    def get_evaluations_by_timeframe(self, start_time: datetime, end_time: datetime) -> List[MinerEvaluation]:
+    def get_evaluations_by_timeframe(self, start_time: datetime, end_time: datetime,
+                                     stream: bool = False) -> Union[List[MinerEvaluation], Iterator[MinerEvaluation]]:
         """
         Get all miner evaluations within a specific timeframe
 
         Args:
             start_time: Start of time range
             end_time: End of time range
+            stream: Yield evaluations lazily from a server-side cursor instead of loading them all
 
         Returns:
-            List of MinerEvaluation objects
+            List of MinerEvaluation objects, or an iterator of them when streaming
         """
-        return self.query_multiple(GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation)
\ No newline at end of file
+        return self.query_multiple(GET_EVALUATIONS_BY_TIMEFRAME, (start_time, end_time), self._map_to_miner_evaluation,
+                                   stream=stream, tuple_rows=True)
\ No newline at end of file
@@ -1,9 +1,11 @@
 """
 Repository for handling database operations for Miner entities
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Any, Iterator, Tuple, Union
+from psycopg2.extras import execute_values
 from ..models.domain_models import Miner
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, BulkWriter, COPY_THRESHOLD
+from .cache import TTLCache, ttl_cached, database_key
 from ..queries import (
     GET_MINER,
     GET_MINER_BY_UID,
@@ -12,23 +14,42 @@ from ..queries import (
     GET_MINER_BY_HOTKEY_AND_GITHUB_ID,
     SET_MINER,
     UPSERT_MINER,
+    UPSERT_MINER_RETURNING,
     GET_ALL_MINERS,
     BULK_UPSERT_MINERS
 )
 
 
+# Column order of the bulk upsert value tuples
+_MINER_COLUMNS = ('uid', 'hotkey', 'github_id')
+
+# Miners change rarely and are looked up on every validator step, so getters of repositories
+# created with use_cache=True share a process-wide cache (reads may lag writes from other
+# processes by up to the TTL)
+MINER_CACHE = TTLCache('miners', ttl=60, maxsize=4096, types=(Miner,))
+
+
 class MinersRepository(BaseRepository):
-    def __init__(self, db_connection):
-        super().__init__(db_connection)
-
-    def _map_to_miner(self, row: Dict[str, Any]) -> Miner:
-        """Map database row to Miner object"""
-        return Miner(
-            uid=row['uid'],
-            hotkey=row['hotkey'],
-            github_id=row['github_id']
+    def __init__(self, db_connection, use_cache: bool = False):
+        super().__init__(db_connection, use_cache=use_cache)
+
+    def _map_to_miner(self, row: Tuple[Any, ...]) -> Miner:
+        """Map a (uid, hotkey, github_id, ...) database row tuple to Miner object"""
+        uid, hotkey, github_id, *_ = row
+        return Miner(uid=uid, hotkey=hotkey, github_id=github_id)
+
+    def _invalidate(self, miner: Miner) -> None:
+        """Drop every cached lookup that may return this miner"""
+        db = database_key(self.db)
+        MINER_CACHE.delete(
+            (db, 'get_miner', miner.uid, miner.hotkey, miner.github_id),
+            (db, 'get_miner_by_uid', miner.uid),
+            (db, 'get_miner_by_hotkey', miner.hotkey),
+            (db, 'get_miner_by_github_id', miner.github_id),
+            (db, 'get_miner_by_hotkey_and_github_id', miner.hotkey, miner.github_id),
         )
 
+    @ttl_cached(MINER_CACHE, 'get_miner')
     def get_miner(self, uid: int, hotkey: str, github_id: str) -> Optional[Miner]:
         """
         Get a miner by their composite primary key
@@ -41,8 +62,9 @@ class MinersRepository(BaseRepository):
         Returns:
             Miner object if found, None otherwise
         """
-        return self.query_single(GET_MINER, (uid, hotkey, github_id), self._map_to_miner)
+        return self.query_single_prepared('get_miner', GET_MINER, (uid, hotkey, github_id), self._map_to_miner, tuple_rows=True)
 
+    @ttl_cached(MINER_CACHE, 'get_miner_by_uid')
     def get_miner_by_uid(self, uid: int) -> Optional[Miner]:
         """
         Get a miner by UID
@@ -53,8 +75,9 @@ class MinersRepository(BaseRepository):
         Returns:
             Miner object if found, None otherwise
         """
-        return self.query_single(GET_MINER_BY_UID, (uid,), self._map_to_miner)
+        return self.query_single_prepared('get_miner_by_uid', GET_MINER_BY_UID, (uid,), self._map_to_miner, tuple_rows=True)
 
+    @ttl_cached(MINER_CACHE, 'get_miner_by_hotkey')
     def get_miner_by_hotkey(self, hotkey: str) -> Optional[Miner]:
         """
         Get a miner by hotkey
@@ -65,8 +88,9 @@ class MinersRepository(BaseRepository):
         Returns:
             Miner object if found, None otherwise
         """
-        return self.query_single(GET_MINER_BY_HOTKEY, (hotkey,), self._map_to_miner)
+        return self.query_single_prepared('get_miner_by_hotkey', GET_MINER_BY_HOTKEY, (hotkey,), self._map_to_miner, tuple_rows=True)
 
+    @ttl_cached(MINER_CACHE, 'get_miner_by_github_id')
     def get_miner_by_github_id(self, github_id: str) -> Optional[Miner]:
         """
         Get a miner by GitHub ID
@@ -77,8 +101,9 @@ class MinersRepository(BaseRepository):
         Returns:
             Miner object if found, None otherwise
         """
-        return self.query_single(GET_MINER_BY_GITHUB_ID, (github_id,), self._map_to_miner)
+        return self.query_single_prepared('get_miner_by_github_id', GET_MINER_BY_GITHUB_ID, (github_id,), self._map_to_miner, tuple_rows=True)
 
+    @ttl_cached(MINER_CACHE, 'get_miner_by_hotkey_and_github_id')
     def get_miner_by_hotkey_and_github_id(self, hotkey: str, github_id: str) -> Optional[Miner]:
         """
         Get a miner by hotkey and GitHub ID
@@ -90,7 +115,7 @@ class MinersRepository(BaseRepository):
         Returns:
             Miner object if found, None otherwise
         """
-        return self.query_single(GET_MINER_BY_HOTKEY_AND_GITHUB_ID, (hotkey, github_id), self._map_to_miner)
+        return self.query_single_prepared('get_miner_by_hotkey_and_github_id', GET_MINER_BY_HOTKEY_AND_GITHUB_ID, (hotkey, github_id), self._map_to_miner, tuple_rows=True)
 
     def set_miner(self, miner: Miner) -> bool:
         """
@@ -107,7 +132,9 @@ class MinersRepository(BaseRepository):
             miner.hotkey,
             miner.github_id
         )
-        return self.set_entity(SET_MINER, params)
+        stored = self.set_entity(SET_MINER, params)
+        self._invalidate(miner)
+        return stored
 
     def upsert_miner(self, miner: Miner) -> bool:
         """
@@ -124,16 +151,57 @@ class MinersRepository(BaseRepository):
             miner.hotkey,
             miner.github_id
         )
-        return self.set_entity(UPSERT_MINER, params)
+        stored = self.set_entity(UPSERT_MINER, params)
+        self._invalidate(miner)
+        return stored
 
-    def get_all_miners(self) -> List[Miner]:
+    def upsert_and_get_miner(self, miner: Miner) -> Optional[Miner]:
+        """
+        Insert or update a miner and return the stored row in the same round-trip.
+        Use instead of upsert_miner followed by a get_miner* read-back.
+
+        Args:
+            miner: Miner object to store
+
+        Returns:
+            Stored Miner object if successful, None otherwise
+        """
+        row = self.execute_command_returning(
+            UPSERT_MINER_RETURNING, (miner.uid, miner.hotkey, miner.github_id), tuple_rows=True
+        )
+        self._invalidate(miner)
+        if row is None:
+            return None
+        stored = self._map_to_miner(row)
+        if self.use_cache:
+            MINER_CACHE.set((database_key(self.db), 'get_miner', stored.uid, stored.hotkey, stored.github_id),
+                            stored)
+        return stored
+
+    def get_all_miners(self, stream: bool = False) -> Union[List[Miner], Iterator[Miner]]:
         """
         Get all miners
 
+        Args:
+            stream: Yield miners lazily from a server-side cursor instead of loading them all
+
+        Returns:
+            List of Miner objects, or an iterator of them when streaming
+        """
+        return self.query_multiple(GET_ALL_MINERS, (), self._map_to_miner, stream=stream, tuple_rows=True)
+
+    def miner_bulk_writer(self, page_size: int = 1000) -> BulkWriter:
+        """
+        Create a BulkWriter upserting (uid, hotkey, github_id) tuples in a single transaction.
+        Use instead of calling upsert_miner in a loop, which commits once per miner.
+
+        Args:
+            page_size: Miners buffered before each write
+
         Returns:
-            List of Miner objects
+            BulkWriter bound to the bulk miner upsert
         """
-        return self.query_multiple(GET_ALL_MINERS, (), self._map_to_miner)
+        return self.bulk_writer(BULK_UPSERT_MINERS, page_size, on_commit=MINER_CACHE.clear)
 
     def store_miners_bulk(self, miners: List[Miner]) -> int:
         """
@@ -153,16 +221,21 @@ class MinersRepository(BaseRepository):
 
         try:
             with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_MINERS.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
+                self._relax_commit_durability(cursor)
+                if len(values) >= COPY_THRESHOLD:
+                    # COPY through a staging table is the fastest ingest path for large batches
+                    self._copy_upsert(cursor, 'miners', _MINER_COLUMNS, values, BULK_UPSERT_MINERS)
+                else:
+                    # Use psycopg2's execute_values for efficient bulk insert
+                    execute_values(
+                        cursor,
+                        BULK_UPSERT_MINERS,
+                        values,
+                        template=None,
+                        page_size=1000
+                    )
                 self.db.commit()
+                MINER_CACHE.clear()
                 return len(values)
         except Exception as e:
             self.db.rollback()
@@ -1,43 +1,76 @@
 """
 Repository for handling database operations for PullRequest entities
 """
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from itertools import groupby
+from operator import itemgetter
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from psycopg2.extras import execute_values
 from ..models.domain_models import PullRequest, FileChange
-from .base_repository import BaseRepository
+from .base_repository import BaseRepository, COPY_THRESHOLD
+from .file_changes_repository import FileChangesRepository
 from ..queries import (
     GET_PULL_REQUEST,
     SET_PULL_REQUEST,
     GET_PULL_REQUESTS_BY_REPOSITORY,
     GET_PULL_REQUESTS_BY_MINER,
     GET_PULL_REQUEST_WITH_FILE_CHANGES,
+    GET_PULL_REQUEST_WITH_FILE_CHANGES_META,
+    GET_FILE_CHANGES_BY_PR_NUMBERS,
+    GET_FILE_CHANGES_BY_PR_NUMBERS_META,
     BULK_UPSERT_PULL_REQUESTS
 )
 
 import numpy as np
 
 
+# Column order of the bulk upsert value tuples
+_PULL_REQUEST_COLUMNS = (
+    'number', 'repository_full_name', 'uid', 'hotkey', 'github_id', 'earned_score',
+    'title', 'merged_at', 'pr_created_at', 'additions', 'deletions', 'commits',
+    'author_login', 'merged_by_login'
+)
+
+# Explicit execute_values row template for the bulk value tuples
+_PULL_REQUEST_TEMPLATE = '(' + ', '.join(['%s'] * len(_PULL_REQUEST_COLUMNS)) + ')'
+
+# Columns read from pull request SELECT results, in PullRequest constructor order
+_PULL_REQUEST_FIELDS = (
+    'number', 'repository_full_name', 'uid', 'hotkey', 'github_id', 'title', 'author_login',
+    'merged_at', 'pr_created_at', 'earned_score', 'additions', 'deletions', 'commits', 'merged_by_login'
+)
+
+
 class PullRequestsRepository(BaseRepository):
     def __init__(self, db_connection):
         super().__init__(db_connection)
-
-    def _map_to_pull_request(self, row: Dict[str, Any]) -> PullRequest:
-        """Map database row to PullRequest object"""
-        return PullRequest(
-            number=row['number'],
-            repository_full_name=row['repository_full_name'],
-            uid=row['uid'],
-            hotkey=row['hotkey'],
-            github_id=row['github_id'],
-            title=row['title'],
-            author_login=row['author_login'],
-            merged_at=row['merged_at'],
-            created_at=row['pr_created_at'],  # DB column pr_created_at maps to model created_at
-            earned_score=float(row.get('earned_score', 0.0)),
-            additions=row['additions'] or 0,
-            deletions=row['deletions'] or 0,
-            commits=row.get('commits', 0),
-            merged_by_login=row['merged_by_login']  # Optional
-        )
+        # Write buffer for set_pull_request; None while batching is disabled
+        self._pending: Optional[List[PullRequest]] = None
+        self._pending_since = 0.0
+        self._pending_lock = threading.Lock()
+        self._flush_every = 500
+        self._max_age_s = 1.0
+
+    def _pull_request_mapper(self, columns: Dict[str, int]) -> Callable[[Tuple[Any, ...]], PullRequest]:
+        """Build a mapper from database row tuples to PullRequest objects for the given column positions"""
+        fields = itemgetter(*(columns[name] for name in _PULL_REQUEST_FIELDS))
+        # Closure binding avoids a global lookup of the constructor per row
+        _PullRequest = PullRequest
+        # Repository names and author logins repeat across rows of one result, so share one string per value
+        dedup = {}.setdefault
+
+        def map_to_pull_request(row: Tuple[Any, ...]) -> PullRequest:
+            (number, repository_full_name, uid, hotkey, github_id, title, author_login, merged_at,
+             created_at, earned_score, additions, deletions, commits, merged_by_login) = fields(row)
+            repository_full_name = dedup(repository_full_name, repository_full_name)
+            author_login = dedup(author_login, author_login)
+            # Positional arguments in PullRequest field order; DB column pr_created_at maps to model created_at
+            return _PullRequest(
+                number, repository_full_name, uid, hotkey, github_id, title, author_login, merged_at,
+                created_at, float(earned_score or 0.0), additions or 0, deletions or 0, commits or 0, merged_by_login
+            )
+        return map_to_pull_request
 
     def _map_to_pull_request_with_file_changes(self, rows: List[Dict[str, Any]]) -> Optional[PullRequest]:
         """Map database rows to PullRequest with nested FileChanges"""
@@ -45,41 +78,32 @@ class PullRequestsRepository(BaseRepository):
             return None
 
         first_row = rows[0]
+        # Read the PR columns from the first row once; every row repeats them
+        number = first_row['number']
+        repository_full_name = first_row['repository_full_name']
 
+        # Positional arguments in PullRequest field order; DB column pr_created_at maps to model created_at
         pull_request = PullRequest(
-            number=first_row['number'],
-            repository_full_name=first_row['repository_full_name'],
-            uid=first_row['uid'],
-            hotkey=first_row['hotkey'],
-            github_id=first_row['github_id'],
-            title=first_row['title'],
-            author_login=first_row['author_login'],
-            merged_at=first_row['merged_at'],
-            created_at=first_row['pr_created_at'],  # DB column pr_created_at maps to model created_at
-            earned_score=float(first_row.get('earned_score', 0.0)),
-            additions=first_row['additions'] or 0,
-            deletions=first_row['deletions'] or 0,
-            commits=first_row.get('commits', 0),
-            merged_by_login=first_row['merged_by_login']  # Optional
+            number, repository_full_name, first_row['uid'], first_row['hotkey'], first_row['github_id'],
+            first_row['title'], first_row['author_login'], first_row['merged_at'], first_row['pr_created_at'],
+            float(first_row['earned_score'] or 0.0), first_row['additions'] or 0, first_row['deletions'] or 0,
+            first_row['commits'] or 0, first_row['merged_by_login']
         )
 
         # Create nested FileChanges if they exist
-        if first_row.get('filename'):  # Check if file changes exist
+        if first_row['filename']:  # Check if file changes exist
+            # Rows from the _META query variant carry no patch column
+            has_patch = 'patch' in first_row
+            file_change_fields = itemgetter('filename', 'changes', 'file_additions', 'file_deletions', 'status', 'file_extension')
+            _FileChange = FileChange
             file_changes = []
             for row in rows:
-                if row['filename']:  # Skip rows without file changes
-                    file_change = FileChange(
-                        pr_number=row['number'],
-                        repository_full_name=row['repository_full_name'],
-                        filename=row['filename'],
-                        changes=row['changes'],
-                        additions=row['file_additions'],
-                        deletions=row['file_deletions'],
-                        status=row['status'],
-                        patch=row['patch'],
-                        file_extension=row['file_extension']
-                    )
-                    file_changes.append(file_change)
+                filename, changes, additions, deletions, status, file_extension = file_change_fields(row)
+                if filename:  # Skip rows without file changes
+                    file_changes.append(_FileChange(
+                        number, repository_full_name, filename, changes, additions, deletions, status,
+                        row['patch'] if has_patch else None, file_extension
+                    ))
 
             # Attach file_changes as a list attribute to the pull_request
             pull_request.file_changes = file_changes
@@ -97,11 +121,91 @@ class PullRequestsRepository(BaseRepository):
         Returns:
             PullRequest object if found, None otherwise
         """
-        return self.query_single(GET_PULL_REQUEST, (pr_number, repository_full_name), self._map_to_pull_request)
+        results = self.query_multiple_indexed(GET_PULL_REQUEST, (pr_number, repository_full_name), self._pull_request_mapper,
+                                              prepared='get_pull_request')
+        return results[0] if results else None
+
+    def enable_batching(self, flush_every: int = 500, max_age_s: float = 1.0) -> None:
+        """
+        Buffer set_pull_request calls and write them with store_pull_requests_bulk.
+
+        The buffer is written once it holds flush_every pull requests, or on the next
+        set_pull_request after its oldest entry is max_age_s seconds old, and by flush()
+        and close(). Buffered pull requests are not in the database until written:
+
+        - reads (even on this repository) do not see them;
+        - file changes and issues referencing them fail their foreign key checks, so
+          call flush() before writing those;
+        - set_pull_request already returned True for them, so a failed write, which
+          drops the whole batch, is only reported by flush()'s count and the log.
+
+        Batches commit independently of the caller's transaction. Use
+        set_pull_request_sync where a write must land before returning.
+
+        Args:
+            flush_every: Pull requests buffered before a write
+            max_age_s: Longest a buffered pull request waits for a write, checked on each call
+        """
+        with self._pending_lock:
+            self._flush_every = flush_every
+            self._max_age_s = max_age_s
+            if self._pending is None:
+                self._pending = []
+
+    def flush(self) -> int:
+        """
+        Write any pull requests buffered by set_pull_request.
+
+        Returns:
+            Count of successfully stored pull requests; 0 when the write failed and the
+            buffered pull requests were dropped
+        """
+        with self._pending_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, []
+        stored = self.store_pull_requests_bulk(pending)
+        if not stored:
+            self.logger.error(f"Dropped {len(pending)} buffered pull requests after a failed write")
+        return stored
+
+    def close(self) -> None:
+        """Write any buffered pull requests, then close every cursor this repository opened."""
+        try:
+            self.flush()
+        finally:
+            super().close()
 
     def set_pull_request(self, pull_request: PullRequest) -> bool:
         """
-        Insert or update a pull request
+        Insert or update a pull request.
+
+        When batching is enabled (see enable_batching) the pull request is buffered and
+        written with later calls or flush(); otherwise it is written immediately.
+
+        Args:
+            pull_request: PullRequest object to store
+
+        Returns:
+            True if successful or buffered, False otherwise. A buffered pull request may
+            still fail to be written later; see enable_batching.
+        """
+        if self._pending is None:
+            return self.set_pull_request_sync(pull_request)
+
+        with self._pending_lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(pull_request)
+            due = (len(self._pending) >= self._flush_every
+                   or time.monotonic() - self._pending_since >= self._max_age_s)
+        if due:
+            return self.flush() > 0
+        return True
+
+    def set_pull_request_sync(self, pull_request: PullRequest) -> bool:
+        """
+        Insert or update a pull request immediately, even when batching is enabled
 
         Args:
             pull_request: PullRequest object to store
@@ -109,16 +213,17 @@ class PullRequestsRepository(BaseRepository):
         Returns:
             True if successful, False otherwise
         """
+        # uids often arrive as numpy ints, which psycopg2 cannot adapt; convert a local
+        # copy so the caller's PullRequest is left untouched
+        uid = pull_request.uid
+        if isinstance(uid, np.integer):
+            uid = uid.item()  # Converts numpy int to Python int
 
-        # uid is causing issues bc it keeps remaining as an np.int64
-        if isinstance(pull_request.uid, np.integer):
-            pull_request.uid = pull_request.uid.item()  # Converts numpy int to Python int
-            
         query = SET_PULL_REQUEST
         params = (
             pull_request.number,
             pull_request.repository_full_name,
-            pull_request.uid,
+            uid,
             pull_request.hotkey,
             pull_request.github_id,
             pull_request.earned_score,
@@ -143,7 +248,8 @@ class PullRequestsRepository(BaseRepository):
         Returns:
             List of PullRequest objects
         """
-        return self.query_multiple(GET_PULL_REQUESTS_BY_REPOSITORY, (repository_full_name,), self._map_to_pull_request)
+        return self.query_multiple_indexed(GET_PULL_REQUESTS_BY_REPOSITORY, (repository_full_name,), self._pull_request_mapper,
+                                           prepared='get_pull_requests_by_repository')
 
     def get_pull_requests_by_miner(self, uid: int, hotkey: str, github_id: str) -> List[PullRequest]:
         """
@@ -157,9 +263,10 @@ class PullRequestsRepository(BaseRepository):
         Returns:
             List of PullRequest objects
         """
-        return self.query_multiple(GET_PULL_REQUESTS_BY_MINER, (uid, hotkey, github_id), self._map_to_pull_request)
+        return self.query_multiple_indexed(GET_PULL_REQUESTS_BY_MINER, (uid, hotkey, github_id), self._pull_request_mapper)
 
-    def get_pull_request_with_file_changes(self, pr_number: int, repository_full_name: str) -> Optional[PullRequest]:
+    def get_pull_request_with_file_changes(self, pr_number: int, repository_full_name: str,
+                                           include_patch: bool = False) -> Optional[PullRequest]:
         """
         Get a pull request with its associated file changes.
 
@@ -169,50 +276,89 @@ class PullRequestsRepository(BaseRepository):
         Args:
             pr_number: PR number
             repository_full_name: Full repository name
+            include_patch: Also load each file's patch text; file changes have patch=None otherwise
 
         Returns:
             PullRequest object with nested FileChanges, or None if not found
         """
-        results = self.execute_query(GET_PULL_REQUEST_WITH_FILE_CHANGES, (pr_number, repository_full_name))
+        query = GET_PULL_REQUEST_WITH_FILE_CHANGES if include_patch else GET_PULL_REQUEST_WITH_FILE_CHANGES_META
+        results = self.execute_query(query, (pr_number, repository_full_name))
         return self._map_to_pull_request_with_file_changes(results)
 
-    def get_pull_requests_by_repository_with_file_changes(self, repository_full_name: str) -> List[PullRequest]:
+    def get_pull_requests_by_repository_with_file_changes(self, repository_full_name: str,
+                                                          include_patch: bool = False) -> List[PullRequest]:
         """
         Get all pull requests for a repository with their associated file changes.
 
-        Note: This can be memory intensive for repositories with many PRs and large file changes.
-        Consider pagination for production use.
+        Runs two queries (the PRs, then all of their file changes) instead of a JOIN that
+        repeats every PR column on each file row. File change rows are streamed, so peak
+        memory is the result objects plus one fetch batch of rows.
 
         Args:
             repository_full_name: Full repository name
+            include_patch: Also load each file's patch text; file changes have patch=None otherwise
 
         Returns:
             List of PullRequest objects with nested file changes
         """
-        # Modify query to get all PRs for repository
-        query = GET_PULL_REQUEST_WITH_FILE_CHANGES.replace(
-            "WHERE pr.number = %s AND pr.repository_full_name = %s",
-            "WHERE pr.repository_full_name = %s ORDER BY pr.merged_at DESC"
-        )
+        pull_requests = self.get_pull_requests_by_repository(repository_full_name)
+        if not pull_requests:
+            return pull_requests
+
+        # psycopg2 adapts the list to an array for = ANY
+        pr_numbers = [pr.number for pr in pull_requests]
+        # Stream file change rows from a server-side cursor so the raw rows (with their
+        # patches) are never buffered alongside the FileChange objects built from them
+        query = GET_FILE_CHANGES_BY_PR_NUMBERS if include_patch else GET_FILE_CHANGES_BY_PR_NUMBERS_META
+        rows = self.execute_query_iter(query, (repository_full_name, pr_numbers))
+
+        # Rows arrive ordered by pr_number, so each PR's file changes form one contiguous run.
+        # PRs without file changes keep file_changes=None, matching get_pull_request_with_file_changes
+        pull_requests_by_number = {pr.number: pr for pr in pull_requests}
+        # Bind hot globals locally once for the whole result
+        _FileChange = FileChange
+        for pr_number, group in groupby(rows, key=itemgetter('pr_number')):
+            pull_requests_by_number[pr_number].file_changes = [
+                _FileChange(
+                    pr_number=pr_number,
+                    repository_full_name=repository_full_name,
+                    filename=row['filename'],
+                    changes=row['changes'],
+                    additions=row['file_additions'],
+                    deletions=row['file_deletions'],
+                    status=row['status'],
+                    patch=row.get('patch'),
+                    file_extension=row['file_extension'],
+                    id=row['id']
+                )
+                for row in group
+            ]
 
-        results = self.execute_query(query, (repository_full_name,))
+        return pull_requests
 
-        # Group results by PR number to handle multiple file changes per PR
-        pr_groups = {}
-        for result in results:
-            pr_key = result['number']
-            if pr_key not in pr_groups:
-                pr_groups[pr_key] = []
-            pr_groups[pr_key].append(result)
+    def prefetch_file_changes(self, pull_requests: List[PullRequest]) -> None:
+        """
+        Load the file changes of many pull requests with a single query and attach them in place.
 
-        # Map each group to a PullRequest with nested data
-        pull_requests = []
-        for pr_results in pr_groups.values():
-            pr = self._map_to_pull_request_with_file_changes(pr_results)
-            if pr:
-                pull_requests.append(pr)
+        Prefer this over loading file changes one PR at a time, e.g. after
+        get_pull_requests_by_miner or when PRs span several repositories.
 
-        return pull_requests
+        Args:
+            pull_requests: PullRequest objects to populate; each gets a (possibly empty) file_changes list
+        """
+        if not pull_requests:
+            return
+
+        file_changes = FileChangesRepository(self.db)
+        try:
+            file_changes_by_pr = file_changes.get_file_changes_for_prs(
+                [(pr.number, pr.repository_full_name) for pr in pull_requests]
+            )
+        finally:
+            file_changes.close()
+
+        for pr in pull_requests:
+            pr.file_changes = file_changes_by_pr[(pr.number, pr.repository_full_name)]
 
     def store_pull_requests_bulk(self, pull_requests: List[PullRequest]) -> int:
         """
@@ -228,17 +374,21 @@ class PullRequestsRepository(BaseRepository):
             return 0
 
         # Prepare data for bulk insert
-        values = []
-        for pr in pull_requests:
-
-            # uid is causing issues bc it keeps remaining as an np.int64
-            if isinstance(pr.uid, np.integer):
-                pr.uid = pr.uid.item()  # Converts numpy int to Python int
-                
-            values.append((
+        # uids often arrive as numpy ints of any width; convert them without touching the
+        # PullRequest objects. An all-integer batch converts in one tolist() pass; batches
+        # numpy cannot hold as integers (None, other types) are converted uid by uid.
+        uids = np.asarray([pr.uid for pr in pull_requests])
+        if uids.dtype.kind in 'iu':
+            uids = uids.tolist()
+        else:
+            uids = [pr.uid.item() if isinstance(pr.uid, np.integer) else pr.uid for pr in pull_requests]
+
+        # Rows are generated as they are sent so only one page is materialized at a time
+        values = (
+            (
                 pr.number,
                 pr.repository_full_name,
-                pr.uid,
+                uid,
                 pr.hotkey,
                 pr.github_id,
                 pr.earned_score,
@@ -250,21 +400,26 @@ class PullRequestsRepository(BaseRepository):
                 pr.commits,
                 pr.author_login,
                 pr.merged_by_login
-            ))
+            )
+            for pr, uid in zip(pull_requests, uids)
+        )
 
         try:
             with self.get_cursor() as cursor:
-                # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
-                execute_values(
-                    cursor,
-                    BULK_UPSERT_PULL_REQUESTS.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
-                )
+                if len(pull_requests) >= COPY_THRESHOLD:
+                    # COPY through a staging table collapses the batch into one streamed load
+                    self._copy_upsert(cursor, 'pull_requests', _PULL_REQUEST_COLUMNS, values, BULK_UPSERT_PULL_REQUESTS)
+                else:
+                    # Use psycopg2's execute_values for efficient bulk insert
+                    execute_values(
+                        cursor,
+                        BULK_UPSERT_PULL_REQUESTS,
+                        values,
+                        template=_PULL_REQUEST_TEMPLATE,
+                        page_size=1000
+                    )
                 self.db.commit()
-                return len(values)
+                return len(pull_requests)
         except Exception as e:
             self.db.rollback()
             self.logger.error(f"Error in bulk pull request storage: {e}")
@@ -1,9 +1,11 @@
 """
 Repository for handling database operations for Repository entities
 """
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Any, Set, Tuple
+from psycopg2.extras import execute_values
 from ..models.domain_models import Repository
 from .base_repository import BaseRepository
+from .cache import TTLCache, ttl_cached, database_key
 from ..queries import (
     GET_REPOSITORY,
     SET_REPOSITORY,
@@ -11,18 +13,37 @@ from ..queries import (
     BULK_UPSERT_REPOSITORIES
 )
 
+# Repositories are near-immutable lookup data, so getters of repositories created with
+# use_cache=True share a process-wide cache
+REPOSITORY_CACHE = TTLCache('repositories', ttl=300, maxsize=4096, types=(Repository,))
+
 
 class RepositoriesRepository(BaseRepository):
-    def __init__(self, db_connection):
-        super().__init__(db_connection)
-
-    def _map_to_repository(self, row: Dict[str, Any]) -> Repository:
-        """Map database row to Repository object"""
-        return Repository(
-            name=row['name'],
-            owner=row['owner']
+    def __init__(self, db_connection, use_cache: bool = False):
+        super().__init__(db_connection, use_cache=use_cache)
+
+    def _map_to_repository(self, row: Tuple[Any, ...]) -> Repository:
+        """Map a (full_name, name, owner) database row tuple to Repository object"""
+        _, name, owner = row
+        return Repository(name=name, owner=owner)
+
+    def invalidate(self, *repository_full_names: str) -> None:
+        """
+        Drop cached repository lookups, e.g. after writing repositories outside this class
+
+        Args:
+            repository_full_names: Full names to drop; drops every cached repository when empty
+        """
+        if not repository_full_names:
+            REPOSITORY_CACHE.clear()
+            return
+        db = database_key(self.db)
+        REPOSITORY_CACHE.delete(
+            (db, 'get_all_repositories'),
+            *((db, 'get_repository', full_name) for full_name in repository_full_names)
         )
 
+    @ttl_cached(REPOSITORY_CACHE, 'get_repository')
     def get_repository(self, repository_full_name: str) -> Optional[Repository]:
         """
         Get a repository by its full name
@@ -33,7 +54,8 @@ class RepositoriesRepository(BaseRepository):
         Returns:
             Repository object if found, None otherwise
         """
-        return self.query_single(GET_REPOSITORY, (repository_full_name,), self._map_to_repository)
+        return self.query_single_prepared('get_repository', GET_REPOSITORY, (repository_full_name,), self._map_to_repository,
+                                          tuple_rows=True)
 
     def set_repository(self, repository: Repository) -> bool:
         """
@@ -50,8 +72,11 @@ class RepositoriesRepository(BaseRepository):
             repository.name,
             repository.owner
         )
-        return self.set_entity(SET_REPOSITORY, params)
+        stored = self.set_entity(SET_REPOSITORY, params)
+        self.invalidate(repository.full_name)
+        return stored
 
+    @ttl_cached(REPOSITORY_CACHE, 'get_all_repositories')
     def get_all_repositories(self) -> List[Repository]:
         """
         Get all repositories
@@ -59,7 +84,7 @@ class RepositoriesRepository(BaseRepository):
         Returns:
             List of Repository objects
         """
-        return self.query_multiple(GET_ALL_REPOSITORIES, (), self._map_to_repository)
+        return self.query_multiple(GET_ALL_REPOSITORIES, (), self._map_to_repository, tuple_rows=True)
 
     def store_repositories_bulk(self, repository_full_names: Set[str]) -> int:
         """
@@ -74,29 +99,32 @@ class RepositoriesRepository(BaseRepository):
         if not repository_full_names:
             return 0
 
-        # Prepare data for bulk insert
-        values = []
-        for full_name in repository_full_names:
-            parts = full_name.split('/')
-            if len(parts) == 2:
-                values.append((full_name, parts[1], parts[0]))  # (full_name, name, owner)
+        count = 0
 
-        if not values:
-            return 0
+        def rows():
+            # Generated as they are sent so only one page is materialized at a time,
+            # keeping only names with exactly one '/'
+            nonlocal count
+            for full_name in repository_full_names:
+                owner, sep, name = full_name.partition('/')
+                if sep and '/' not in name:
+                    count += 1
+                    yield (full_name, name, owner)  # (full_name, name, owner)
 
         try:
             with self.get_cursor() as cursor:
                 # Use psycopg2's execute_values for efficient bulk insert
-                from psycopg2.extras import execute_values
                 execute_values(
                     cursor,
-                    BULK_UPSERT_REPOSITORIES.replace('VALUES %s', 'VALUES %s'),
-                    values,
-                    template=None,
-                    page_size=100
+                    BULK_UPSERT_REPOSITORIES,
+                    rows(),
+                    template='(%s, %s, %s)',
+                    page_size=1000
                 )
                 self.db.commit()
-                return len(values)
+                if count:
+                    self.invalidate(*repository_full_names)
+                return count
         except Exception as e:
             self.db.rollback()
             self.logger.error(f"Error in bulk repository storage: {e}")
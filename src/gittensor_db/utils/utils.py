@@ -1,20 +1,35 @@
-import pytz
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 
-CHICAGO_TZ = pytz.timezone('America/Chicago')
 
+def _load_chicago_tz():
+    """Load America/Chicago from zoneinfo, falling back to pytz's bundled zone data"""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo('America/Chicago')
+    except (ImportError, KeyError):
+        # Python 3.8 has no zoneinfo, and zoneinfo raises ZoneInfoNotFoundError (a KeyError)
+        # on hosts with neither a system tz database nor the tzdata package
+        import pytz
+        return pytz.timezone('America/Chicago')
+
+
+CHICAGO_TZ = _load_chicago_tz()
+
+
+# GitHub timestamps repeat heavily across a fetch and datetimes are immutable, so parses are memoized
+@lru_cache(maxsize=65536)
 def parse_github_timestamp(timestamp_str: str) -> datetime:
     """
     Parse GitHub's ISO format timestamp and convert to Chicago timezone.
     GitHub returns timestamps like: 2024-01-15T10:30:00Z
     """
-    # Parse the UTC timestamp
-    utc_dt = datetime.fromisoformat(timestamp_str.rstrip("Z"))
-    
-    # Add UTC timezone info
-    utc_dt = pytz.utc.localize(utc_dt)
-    
+    # Parse the timestamp, reading the trailing Z as a UTC offset
+    dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+
+    # Timestamps without an offset are UTC
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+
     # Convert to Chicago timezone
-    chicago_dt = utc_dt.astimezone(CHICAGO_TZ)
-    
-    return chicago_dt
\ No newline at end of file
+    return dt.astimezone(CHICAGO_TZ)
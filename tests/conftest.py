@@ -3,6 +3,7 @@ Test configuration and fixtures
 """
 import pytest
 from unittest.mock import Mock
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 from src.gittensor_db.connection.database import create_database_connection
 
 @pytest.fixture
@@ -11,6 +12,8 @@ def mock_db_connection():
     mock_conn = Mock()
     mock_cursor = Mock()
     mock_conn.cursor.return_value = mock_cursor
+    # A freshly checked out connection has no transaction open
+    mock_conn.info.transaction_status = TRANSACTION_STATUS_IDLE
     return mock_conn
 
 @pytest.fixture
@@ -0,0 +1,59 @@
+"""
+Connection tests
+File: tests/test_connection.py
+"""
+import gc
+import psycopg2
+import pytest
+from unittest.mock import Mock
+from src.gittensor_db.connection import database
+from src.gittensor_db.connection.database import PooledConnection, database_connection
+
+
+def test_pooled_connection_close_returns_to_pool():
+    """Test that closing a pooled connection hands it back to the pool"""
+    pool = Mock()
+    raw = Mock(closed=0)
+    conn = PooledConnection(pool, raw)
+
+    conn.autocommit = False
+    conn.commit()
+    assert raw.autocommit is False
+    raw.commit.assert_called_once()
+
+    conn.close()
+    conn.close()
+    pool.putconn.assert_called_once_with(raw)
+    assert conn.closed
+
+
+def test_pooled_connection_rejects_use_after_close():
+    """Test a returned connection raises psycopg2's InterfaceError for reads and writes alike"""
+    conn = PooledConnection(Mock(), Mock(closed=0))
+    conn.close()
+
+    with pytest.raises(psycopg2.InterfaceError):
+        conn.cursor()
+    with pytest.raises(psycopg2.InterfaceError):
+        conn.autocommit = True
+
+
+def test_database_connection_returns_connection_to_pool(monkeypatch):
+    """Test that the context manager hands its connection back to the pool on exit"""
+    pool = Mock()
+    monkeypatch.setattr(database, "_get_pool", lambda: pool)
+
+    with database_connection() as conn:
+        assert conn._raw is pool.getconn.return_value
+    pool.putconn.assert_called_once_with(pool.getconn.return_value)
+
+
+def test_pooled_connection_returned_when_garbage_collected():
+    """Test that a wrapper dropped without close() still hands its connection back"""
+    pool = Mock()
+    raw = Mock(closed=0)
+    conn = PooledConnection(pool, raw)
+
+    del conn
+    gc.collect()
+    pool.putconn.assert_called_once_with(raw)
@@ -4,14 +4,23 @@ File: tests/test_integration.py
 """
 import pytest
 import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
 from src.gittensor_db import (
     create_database_connection,
+    close_database_pool,
     RepositoriesRepository,
     MinerEvaluationsRepository,
-    PullRequestsRepository
+    PullRequestsRepository,
+    MinersRepository,
+    IssuesRepository,
+    FileChangesRepository
 )
-from src.gittensor_db.models.domain_models import Repository, MinerEvaluation, PullRequest
+from src.gittensor_db.repositories import file_changes_repository, issues_repository, pull_requests_repository
+from src.gittensor_db.models.domain_models import Repository, MinerEvaluation, PullRequest, Miner, Issue, FileChange
+
+# An offset that differs from any plausible session TimeZone, so a dropped offset shows up
+AWARE_TIMESTAMP = datetime(2024, 1, 15, 10, 30, tzinfo=timezone(timedelta(hours=5)))
 
 
 class TestIntegration:
@@ -41,6 +50,7 @@ class TestIntegration:
         for key, value in test_vars.items():
             self.original_env[key] = os.getenv(key)
             os.environ[key] = value
+        close_database_pool()
         
         self.db = create_database_connection()
         if not self.db:
@@ -58,6 +68,7 @@ class TestIntegration:
                 os.environ.pop(key, None)
             else:
                 os.environ[key] = value
+        close_database_pool()
 
     def test_repository_crud(self):
         """Test repository CRUD operations"""
@@ -71,4 +82,130 @@ class TestIntegration:
         retrieved = repo_repo.get_repository("test-owner/test-repo")
         assert retrieved is not None
         assert retrieved.name == "test-repo"
-        assert retrieved.owner == "test-owner"
\ No newline at end of file
+        assert retrieved.owner == "test-owner"
+
+    def _create_timestamp_fixture_pull_requests(self, numbers):
+        """Create a fresh repository and miner owning one PR per number"""
+        with self.db.cursor() as cursor:
+            cursor.execute("DELETE FROM repositories WHERE full_name = 'tz-owner/tz-repo'")
+        self.db.commit()
+        RepositoriesRepository(self.db).set_repository(Repository(name="tz-repo", owner="tz-owner"))
+        MinersRepository(self.db).upsert_miner(Miner(uid=900001, hotkey="tz-hk", github_id="tz-gh"))
+        pull_requests = [
+            PullRequest(number=number, repository_full_name="tz-owner/tz-repo", uid=900001, hotkey="tz-hk",
+                        github_id="tz-gh", title="t", author_login="a",
+                        merged_at=AWARE_TIMESTAMP, created_at=AWARE_TIMESTAMP)
+            for number in numbers
+        ]
+        return PullRequestsRepository(self.db), pull_requests
+
+    def test_bulk_issue_timestamps_match_across_load_paths(self, monkeypatch):
+        """Test COPY and execute_values store the same timestamps for tz-aware datetimes"""
+        pr_repo, pull_requests = self._create_timestamp_fixture_pull_requests([1])
+        assert pr_repo.set_pull_request(pull_requests[0])
+        issue_repo = IssuesRepository(self.db)
+
+        monkeypatch.setattr(issues_repository, "COPY_THRESHOLD", 10 ** 9)
+        assert issue_repo.store_issues_bulk([Issue(1, 1, "tz-owner/tz-repo", "small", AWARE_TIMESTAMP, AWARE_TIMESTAMP)]) == 1
+        monkeypatch.setattr(issues_repository, "COPY_THRESHOLD", 1)
+        assert issue_repo.store_issues_bulk([Issue(2, 1, "tz-owner/tz-repo", "copy", AWARE_TIMESTAMP, AWARE_TIMESTAMP)]) == 1
+
+        inserted = issue_repo.get_issue(1, "tz-owner/tz-repo")
+        copied = issue_repo.get_issue(2, "tz-owner/tz-repo")
+        assert (copied.created_at, copied.closed_at) == (inserted.created_at, inserted.closed_at)
+
+    def test_bulk_pull_request_timestamps_match_across_load_paths(self, monkeypatch):
+        """Test COPY and execute_values store the same merged_at and pr_created_at for tz-aware datetimes"""
+        pr_repo, pull_requests = self._create_timestamp_fixture_pull_requests([1, 2])
+
+        monkeypatch.setattr(pull_requests_repository, "COPY_THRESHOLD", 10 ** 9)
+        assert pr_repo.store_pull_requests_bulk(pull_requests[:1]) == 1
+        monkeypatch.setattr(pull_requests_repository, "COPY_THRESHOLD", 1)
+        assert pr_repo.store_pull_requests_bulk(pull_requests[1:]) == 1
+
+        inserted = pr_repo.get_pull_request(1, "tz-owner/tz-repo")
+        copied = pr_repo.get_pull_request(2, "tz-owner/tz-repo")
+        assert (copied.merged_at, copied.created_at) == (inserted.merged_at, inserted.created_at)
+
+    def test_copy_upserts_share_one_transaction(self):
+        """Test two COPY loads into the same table can run before a single commit"""
+        pr_repo, pull_requests = self._create_timestamp_fixture_pull_requests([1])
+        assert pr_repo.set_pull_request(pull_requests[0])
+        issue_repo = IssuesRepository(self.db)
+
+        with issue_repo.get_cursor() as cursor:
+            for number in (1, 2):
+                issue_repo._copy_upsert(cursor, "issues", issues_repository._ISSUE_COLUMNS,
+                                        [(number, 1, "tz-owner/tz-repo", "copy", AWARE_TIMESTAMP, None)],
+                                        issues_repository.BULK_UPSERT_ISSUES)
+        self.db.commit()
+        assert issue_repo.get_issue(1, "tz-owner/tz-repo") is not None
+        assert issue_repo.get_issue(2, "tz-owner/tz-repo") is not None
+
+    def test_deallocated_prepared_statement_retried_without_losing_transaction(self):
+        """Test a deallocated prepared statement is re-prepared, idle or inside the caller's transaction"""
+        self._create_timestamp_fixture_pull_requests([])
+        repo = RepositoriesRepository(self.db)
+        assert repo.get_repository("tz-owner/tz-repo") is not None
+        with self.db.cursor() as cursor:
+            cursor.execute("DEALLOCATE get_repository")
+        self.db.commit()
+        assert repo.get_repository("tz-owner/tz-repo") is not None
+        self.db.commit()
+
+        with self.db.cursor() as cursor:
+            cursor.execute("INSERT INTO repositories (full_name, name, owner) VALUES ('tz-owner/pending', 'pending', 'tz-owner')")
+            cursor.execute("DEALLOCATE get_repository")
+        assert repo.get_repository("tz-owner/tz-repo") is not None
+        assert self.db.info.transaction_status == TRANSACTION_STATUS_INTRANS
+        # The caller's uncommitted insert survived the retry
+        assert repo.get_repository("tz-owner/pending") is not None
+        self.db.rollback()
+        assert repo.get_repository("tz-owner/pending") is None
+
+    def test_file_changes_loaded_for_many_pull_requests(self, monkeypatch):
+        """Test batched file change reads group rows by PR, including PRs without file changes"""
+        pr_repo, pull_requests = self._create_timestamp_fixture_pull_requests([1, 2, 3])
+        assert pr_repo.store_pull_requests_bulk(pull_requests) == 3
+        file_change_repo = FileChangesRepository(self.db)
+        file_changes = [
+            FileChange(1, "tz-owner/tz-repo", "a.py", 3, 2, 1, "modified", patch="@@ a"),
+            FileChange(1, "tz-owner/tz-repo", "b.md", 1, 1, 0, "added", patch="@@ b"),
+            FileChange(2, "tz-owner/tz-repo", "c.rs", 5, 5, 0, "added", patch="@@ c"),
+        ]
+        # Load through COPY, then store the same keys again; existing file changes are kept (ON CONFLICT DO NOTHING)
+        monkeypatch.setattr(file_changes_repository, "COPY_THRESHOLD", 1)
+        assert file_change_repo.store_file_changes_bulk(file_changes) == 3
+        file_changes[0].changes = 30
+        assert file_change_repo.store_file_changes_bulk(file_changes) == 3
+
+        by_pr = file_change_repo.get_file_changes_for_prs([(number, "tz-owner/tz-repo") for number in (1, 2, 3)])
+        assert [[fc.filename for fc in by_pr[(number, "tz-owner/tz-repo")]] for number in (1, 2, 3)] == \
+            [["a.py", "b.md"], ["c.rs"], []]
+        assert by_pr[(1, "tz-owner/tz-repo")][0].changes == 3
+
+        pr_repo.prefetch_file_changes(pull_requests)
+        assert [len(pr.file_changes) for pr in pull_requests] == [2, 1, 0]
+
+        streamed = {pr.number: pr for pr in pr_repo.get_pull_requests_by_repository_with_file_changes("tz-owner/tz-repo")}
+        assert [fc.filename for fc in streamed[1].file_changes] == ["a.py", "b.md"]
+        assert [fc.filename for fc in streamed[2].file_changes] == ["c.rs"]
+        assert streamed[3].file_changes is None
+        assert streamed[1].file_changes[0].patch is None
+        with_patch = pr_repo.get_pull_requests_by_repository_with_file_changes("tz-owner/tz-repo", include_patch=True)
+        assert {fc.patch for pr in with_patch for fc in pr.file_changes or []} == {"@@ a", "@@ b", "@@ c"}
+
+    def test_latest_miner_evaluations_for_many_miners(self):
+        """Test the batched lookup returns each miner's newest evaluation and skips miners without one"""
+        self._create_timestamp_fixture_pull_requests([])
+        evaluation_repo = MinerEvaluationsRepository(self.db)
+        with self.db.cursor() as cursor:
+            cursor.execute("DELETE FROM miner_evaluations WHERE uid = 900001")
+        self.db.commit()
+        assert evaluation_repo.set_miner_evaluation(MinerEvaluation(uid=900001, hotkey="tz-hk", github_id="tz-gh", total_score=1.0))
+        assert evaluation_repo.set_miner_evaluation(MinerEvaluation(uid=900001, hotkey="tz-hk", github_id="tz-gh", total_score=2.0))
+
+        latest = evaluation_repo.get_latest_miner_evaluations_for([(900001, "tz-hk"), (900001, "tz-hk"), (900002, "none")])
+        assert list(latest) == [(900001, "tz-hk")]
+        assert latest[(900001, "tz-hk")].total_score == 2.0
+
@@ -0,0 +1,26 @@
+"""
+Migrator tests
+File: tests/test_migrator.py
+"""
+from unittest.mock import MagicMock
+from src.gittensor_db.migrations.migrator import DatabaseMigrator
+
+
+def test_migrate_rolls_back_all_files_on_failure():
+    """Test a failing migration rolls back to its savepoint and aborts the whole run"""
+    db = MagicMock()
+    cursor = db.cursor.return_value.__enter__.return_value
+    sql_by_file = {name: DatabaseMigrator.read_migration_file(name) for name in ('repositories.sql', 'miners.sql')}
+
+    def execute(statement):
+        if statement == sql_by_file['miners.sql']:
+            raise RuntimeError("boom")
+
+    cursor.execute.side_effect = execute
+
+    assert DatabaseMigrator(db).migrate() is False
+    executed = [call.args[0] for call in cursor.execute.call_args_list]
+    assert executed[:3] == ["SAVEPOINT migration_0", sql_by_file['repositories.sql'], "RELEASE SAVEPOINT migration_0"]
+    assert executed[-1] == "ROLLBACK TO SAVEPOINT migration_1"
+    db.rollback.assert_called_once()
+    db.commit.assert_not_called()
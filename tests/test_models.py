@@ -2,8 +2,13 @@
 Test domain models
 File: tests/test_models.py
 """
+import sys
+import types
+import pytest
+from datetime import datetime
+from src.gittensor_db.models import _kernels
 from src.gittensor_db.models.domain_models import (
-    Repository, FileChange, MinerEvaluation
+    Repository, FileChange, MinerEvaluation, PullRequest
 )
 
 
@@ -39,4 +44,121 @@ def test_miner_evaluation_model():
     assert evaluation.uid == 42
     assert evaluation.id == 1
     assert len(evaluation.unique_repos_contributed_to) == 3
-    assert evaluation.unique_repos_count == 3
\ No newline at end of file
+    assert evaluation.unique_repos_count == 3
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses require Python 3.10+")
+def test_models_are_slotted():
+    """Test domain models do not carry a per-instance __dict__"""
+    repo = Repository(name="my-repo", owner="my-owner")
+    assert not hasattr(repo, "__dict__")
+    with pytest.raises(AttributeError):
+        repo.unexpected_attribute = True
+
+
+def test_miner_evaluation_metric_totals():
+    """Test metric and score totals are computed from pull requests"""
+    now = datetime.now()
+    evaluation = MinerEvaluation(uid=1, hotkey="hk")
+    evaluation.pull_requests = [
+        PullRequest(
+            number=n, repository_full_name=repo, uid=1, hotkey="hk", github_id="gh",
+            title="t", author_login="a", merged_at=now, created_at=now,
+            earned_score=score, additions=adds, deletions=dels
+        )
+        for n, repo, score, adds, dels in [(1, "o/a", 1.5, 10, 2), (2, "o/b", 2.0, 5, 0), (3, "o/a", 0.5, 1, 1)]
+    ]
+    evaluation.calculate_metric_totals(include_score=True)
+    assert evaluation.total_lines_changed == 19
+    assert evaluation.unique_repos_contributed_to == {"o/a", "o/b"}
+    assert evaluation.unique_repos_count == 2
+    assert evaluation.total_score == 4.0
+
+
+def _evaluation_with_many_pull_requests():
+    now = datetime.now()
+    evaluation = MinerEvaluation(uid=1, hotkey="hk")
+    evaluation.pull_requests = [
+        PullRequest(
+            number=n, repository_full_name=f"o/r{n % 3}", uid=1, hotkey="hk", github_id="gh",
+            title="t", author_login="a", merged_at=now, created_at=now,
+            earned_score=0.5, additions=2, deletions=1
+        )
+        for n in range(_kernels.JIT_MIN_PULL_REQUESTS)
+    ]
+    return evaluation
+
+
+@pytest.mark.skipif(not _kernels.NUMBA_AVAILABLE, reason="numba not installed")
+def test_miner_evaluation_metric_totals_jitted(monkeypatch):
+    """Test large evaluations are aggregated by the jitted kernel"""
+    monkeypatch.setattr(_kernels, "_compiled_aggregate", None)
+    evaluation = _evaluation_with_many_pull_requests()
+    evaluation.calculate_metric_totals(include_score=True)
+    assert _kernels._compiled_aggregate is not _kernels._aggregate_pull_request_totals
+    assert evaluation.total_lines_changed == 3 * _kernels.JIT_MIN_PULL_REQUESTS
+    assert evaluation.total_score == 0.5 * _kernels.JIT_MIN_PULL_REQUESTS
+    assert evaluation.unique_repos_count == 3
+
+
+def test_miner_evaluation_metric_totals_numba_import_failure(monkeypatch):
+    """Test a numba that is installed but fails to import falls back to the Python loop"""
+    monkeypatch.setattr(_kernels, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr("src.gittensor_db.models.domain_models.NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(_kernels, "_compiled_aggregate", None)
+    monkeypatch.setitem(sys.modules, "numba", None)  # makes "from numba import ..." raise ImportError
+    evaluation = _evaluation_with_many_pull_requests()
+    evaluation.calculate_metric_totals(include_score=True)
+    assert _kernels._compiled_aggregate is _kernels._aggregate_pull_request_totals
+    assert evaluation.total_lines_changed == 3 * _kernels.JIT_MIN_PULL_REQUESTS
+    assert evaluation.total_score == 0.5 * _kernels.JIT_MIN_PULL_REQUESTS
+
+
+def test_miner_evaluation_metric_totals_numba_compile_failure(monkeypatch):
+    """Test a numba that imports but fails to compile or cache falls back to the Python loop"""
+    def failing_njit(**options):
+        def decorate(function):
+            def compiled(*args):
+                raise RuntimeError("cannot cache function: no locator available")
+            return compiled
+        return decorate
+
+    monkeypatch.setattr(_kernels, "NUMBA_AVAILABLE", True)
+    monkeypatch.setattr("src.gittensor_db.models.domain_models.NUMBA_AVAILABLE", True)
+    monkeypatch.setattr(_kernels, "_compiled_aggregate", None)
+    monkeypatch.setitem(sys.modules, "numba", types.SimpleNamespace(njit=failing_njit))
+    evaluation = _evaluation_with_many_pull_requests()
+    evaluation.calculate_metric_totals(include_score=True)
+    assert _kernels._compiled_aggregate is _kernels._aggregate_pull_request_totals
+    assert evaluation.total_lines_changed == 3 * _kernels.JIT_MIN_PULL_REQUESTS
+    assert evaluation.total_score == 0.5 * _kernels.JIT_MIN_PULL_REQUESTS
+
+
+def test_pull_request_from_graphql_batch():
+    """Test PullRequests are built from a page of GraphQL nodes"""
+    nodes = [
+        {
+            'number': number,
+            'title': f"PR {number}",
+            'repository': {'name': 'repo', 'owner': {'login': 'owner'}},
+            'author': {'login': 'dev'},
+            'mergedAt': '2024-01-15T10:30:00Z',
+            'createdAt': '2024-01-14T10:30:00Z',
+            'additions': 10,
+            'deletions': 2,
+            'commits': {'totalCount': 3},
+            'mergedBy': None,
+            'closingIssuesReferences': {'nodes': [
+                {'number': 7, 'title': 'bug', 'createdAt': '2024-01-01T00:00:00Z', 'closedAt': '2024-01-15T10:30:00Z'},
+                {'number': 8, 'title': 'open', 'createdAt': '2024-01-01T00:00:00Z', 'closedAt': None},
+            ]},
+        }
+        for number in (1, 2)
+    ]
+    prs = PullRequest.from_graphql_batch(nodes, uid=1, hotkey="hk", github_id="gh")
+    assert [pr.number for pr in prs] == [1, 2]
+    assert prs[0].repository_full_name == "owner/repo"
+    assert prs[0].commits == 3
+    assert prs[0].merged_by_login is None
+    assert [issue.number for issue in prs[1].issues] == [7]
+    assert prs[1].issues[0].pr_number == 2
+    assert PullRequest.from_graphql_response(nodes[0], 1, "hk", "gh") == prs[0]
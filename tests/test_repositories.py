@@ -1,18 +1,359 @@
 """
 Basic repository tests
 """
+import gc
+import threading
 import pytest
-from src.gittensor_db.repositories import RepositoriesRepository
-from src.gittensor_db.models.domain_models import Repository
+from dataclasses import replace
+from unittest.mock import Mock
+import numpy as np
+from psycopg2 import sql
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS, cursor as TupleCursor
+from src.gittensor_db.connection.database import PooledConnection
+from src.gittensor_db.repositories import RepositoriesRepository, IssuesRepository, MinersRepository, PullRequestsRepository
+from src.gittensor_db.repositories import miners_repository, pull_requests_repository
+from src.gittensor_db.repositories.base_repository import _CopyRowReader, numbered_placeholders
+from src.gittensor_db.repositories.cache import TTLCache
+from src.gittensor_db.repositories.miners_repository import MINER_CACHE
+from src.gittensor_db.repositories.repositories_repository import REPOSITORY_CACHE
+from src.gittensor_db.models.domain_models import Repository, Miner, PullRequest
+
 
 def test_repositories_repository_init(mock_db_connection):
     """Test repository initialization"""
     repo = RepositoriesRepository(mock_db_connection)
     assert repo.db == mock_db_connection
 
+
 def test_repository_model():
     """Test Repository domain model"""
     repo = Repository(name="test-repo", owner="test-owner")
     assert repo.full_name == "test-owner/test-repo"
     assert repo.name == "test-repo"
-    assert repo.owner == "test-owner"
\ No newline at end of file
+    assert repo.owner == "test-owner"
+
+
+def test_repository_cache_read_after_write(mock_db_connection):
+    """Test cached repository lookups skip the database until a write evicts them"""
+    REPOSITORY_CACHE.clear()
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [('test-owner/test-repo', 'test-repo', 'test-owner')]
+    repo = RepositoriesRepository(mock_db_connection, use_cache=True)
+
+    first = repo.get_repository("test-owner/test-repo")
+    assert repo.get_repository("test-owner/test-repo") == first
+    assert cursor.fetchall.call_count == 1
+
+    repo.set_repository(Repository(name="test-repo", owner="test-owner"))
+    repo.get_repository("test-owner/test-repo")
+    assert cursor.fetchall.call_count == 2
+    REPOSITORY_CACHE.clear()
+
+
+def test_repository_cache_is_opt_in(mock_db_connection):
+    """Test repositories created without use_cache always query the database"""
+    REPOSITORY_CACHE.clear()
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [('test-owner/test-repo', 'test-repo', 'test-owner')]
+    RepositoriesRepository(mock_db_connection, use_cache=True).get_repository("test-owner/test-repo")
+    repo = RepositoriesRepository(mock_db_connection)
+
+    repo.get_repository("test-owner/test-repo")
+    repo.get_repository("test-owner/test-repo")
+    assert cursor.fetchall.call_count == 3
+    REPOSITORY_CACHE.clear()
+
+
+def test_cached_repository_list_is_copied_per_caller(mock_db_connection):
+    """Test callers of get_all_repositories cannot mutate each other's cached list"""
+    REPOSITORY_CACHE.clear()
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [('test-owner/test-repo', 'test-repo', 'test-owner')]
+    repo = RepositoriesRepository(mock_db_connection, use_cache=True)
+
+    first = repo.get_all_repositories()
+    first.append(Repository(name="other", owner="test-owner"))
+    second = repo.get_all_repositories()
+    assert second == [Repository(name="test-repo", owner="test-owner")]
+    assert second is not repo.get_all_repositories()
+    assert cursor.fetchall.call_count == 1
+    REPOSITORY_CACHE.clear()
+
+
+def test_copy_row_reader_escapes_text_format():
+    """Test rows are streamed in COPY text format with NULLs and control characters escaped"""
+    reader = _CopyRowReader([(1, None, "a\tb"), (2, "", "c\\d\ne")])
+    payload = reader.read(5) + reader.read()
+    assert payload == "1\t\\N\ta\\tb\n2\t\tc\\\\d\\ne\n"
+    assert reader.read() == ""
+
+
+def test_copy_row_reader_streams_long_rows_in_small_reads():
+    """Test a row longer than the read size is returned intact across many reads"""
+    patch = "x" * 100000
+    reader = _CopyRowReader([(1, patch), (2, "y")])
+    chunks = iter(lambda: reader.read(8192), "")
+    assert "".join(chunks) == f"1\t{patch}\n2\ty\n"
+
+
+def test_issue_getter_maps_tuple_rows(mock_db_connection):
+    """Test issue lookups request a tuple cursor and map rows by SELECT position"""
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [(7, 3, "test-owner/test-repo", "Bug", None, None)]
+    issues = IssuesRepository(mock_db_connection).get_issues_by_repository("test-owner/test-repo")
+
+    mock_db_connection.cursor.assert_called_with(cursor_factory=TupleCursor)
+    assert issues[0].number == 7
+    assert issues[0].pr_number == 3
+    assert issues[0].title == "Bug"
+
+
+def test_bulk_store_relaxes_durability_only_in_its_own_transaction(mock_db_connection, monkeypatch):
+    """Test synchronous_commit is only turned off when the bulk store starts the transaction"""
+    monkeypatch.setattr(miners_repository, "execute_values", lambda *args, **kwargs: None)
+    cursor = mock_db_connection.cursor.return_value
+    miners = [Miner(uid=1, hotkey="hk", github_id="gh")]
+
+    assert MinersRepository(mock_db_connection).store_miners_bulk(miners) == 1
+    cursor.execute.assert_called_once_with("SET LOCAL synchronous_commit TO off")
+
+    cursor.execute.reset_mock()
+    mock_db_connection.info.transaction_status = TRANSACTION_STATUS_INTRANS
+    assert MinersRepository(mock_db_connection).store_miners_bulk(miners) == 1
+    cursor.execute.assert_not_called()
+
+
+def test_miner_bulk_writer_single_commit(mock_db_connection, monkeypatch):
+    """Test the bulk writer flushes every page_size rows and commits once on exit"""
+    pages = []
+    monkeypatch.setattr("src.gittensor_db.repositories.base_repository.execute_values",
+                        lambda cursor, query, rows, page_size: pages.append(list(rows)))
+
+    with MinersRepository(mock_db_connection).miner_bulk_writer(page_size=2) as writer:
+        for uid in range(5):
+            writer.add((uid, f"hk{uid}", "gh"))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert writer.written == 5
+    mock_db_connection.commit.assert_called_once()
+    mock_db_connection.rollback.assert_not_called()
+
+
+def test_miner_lookup_cache_invalidated_on_upsert(mock_db_connection):
+    """Test miner getters are served from the shared cache until the miner is written"""
+    MINER_CACHE.clear()
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [(5, "hk5", "gh5", None, None)]
+    repo = MinersRepository(mock_db_connection, use_cache=True)
+
+    first = repo.get_miner_by_uid(5)
+    cached = repo.get_miner_by_uid(uid=5)
+    assert cached == first and cached is not first  # callers get their own copy
+    fetches = cursor.fetchall.call_count
+
+    repo.upsert_miner(Miner(uid=5, hotkey="hk5", github_id="gh5"))
+    repo.get_miner_by_uid(5)
+    assert cursor.fetchall.call_count == fetches + 1
+    MINER_CACHE.clear()
+
+
+def test_ttl_cache_serializes_only_registered_types():
+    """Test the Redis serializer round-trips registered models and rejects anything else"""
+    cache = TTLCache("test", types=(Miner,))
+    miners = [Miner(uid=1, hotkey="hk1", github_id="gh1"), Miner(uid=2, hotkey="hk2", github_id="gh2")]
+    assert cache.loads(cache.dumps(miners)) == miners
+
+    with pytest.raises(TypeError):
+        cache.dumps(Repository(name="r", owner="o"))
+    with pytest.raises(ValueError):
+        cache.loads('{"__type__": "Repository", "fields": {"name": "r", "owner": "o"}}')
+
+
+def test_miner_cache_scoped_per_database(mock_db_connection):
+    """Test repositories on different databases do not share cached lookups"""
+    MINER_CACHE.clear()
+    other_db = Mock()
+    mock_db_connection.info.dbname = "validator_a"
+    other_db.info.dbname = "validator_b"
+    other_db.info.transaction_status = TRANSACTION_STATUS_IDLE
+    for db, uid in ((mock_db_connection, 5), (other_db, 6)):
+        db.cursor.return_value.fetchone.return_value = None
+        db.cursor.return_value.fetchall.return_value = [(uid, "hk", "gh")]
+
+    assert MinersRepository(mock_db_connection, use_cache=True).get_miner_by_uid(1).uid == 5
+    assert MinersRepository(other_db, use_cache=True).get_miner_by_uid(1).uid == 6
+    MINER_CACHE.clear()
+
+
+def test_miner_cache_is_opt_in(mock_db_connection):
+    """Test miner repositories created without use_cache always query the database"""
+    MINER_CACHE.clear()
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = [(5, "hk5", "gh5", None, None)]
+    repo = MinersRepository(mock_db_connection)
+
+    repo.get_miner_by_uid(5)
+    repo.get_miner_by_uid(5)
+    assert cursor.fetchall.call_count == 2
+    assert len(MINER_CACHE._entries) == 0
+    MINER_CACHE.clear()
+
+
+def test_cursor_reused_until_close(mock_db_connection):
+    """Test queries share one cursor per thread and close() releases it"""
+    mock_db_connection.closed = 0
+    cursor = mock_db_connection.cursor.return_value
+    cursor.closed = False
+    repo = RepositoriesRepository(mock_db_connection)
+
+    repo.execute_query("SELECT 1")
+    repo.execute_query("SELECT 2")
+    assert mock_db_connection.cursor.call_count == 1
+    cursor.close.assert_not_called()
+
+    repo.close()
+    cursor.close.assert_called_once()
+
+
+def test_cursors_of_finished_threads_are_released(mock_db_connection):
+    """Test a thread's cursor is not kept alive by the repository after the thread ends"""
+    mock_db_connection.closed = 0
+    mock_db_connection.cursor.side_effect = lambda **kwargs: Mock(closed=False)
+    repo = RepositoriesRepository(mock_db_connection)
+
+    worker = threading.Thread(target=repo.execute_query, args=("SELECT 1",))
+    worker.start()
+    worker.join()
+    gc.collect()
+    assert len(repo._open_cursors) == 0
+
+
+def test_numbered_placeholders():
+    """Test %s placeholders are rewritten to $n for PREPARE and asyncpg"""
+    query = "SELECT * FROM miners WHERE uid = %s AND hotkey = %s"
+    assert numbered_placeholders(query) == "SELECT * FROM miners WHERE uid = $1 AND hotkey = $2"
+    assert numbered_placeholders("SELECT * FROM repositories WHERE name LIKE 'a%%' AND owner = %s") == \
+        "SELECT * FROM repositories WHERE name LIKE 'a%' AND owner = $1"
+
+
+def test_composed_queries_bypass_encoding_cache(mock_db_connection):
+    """Test psycopg2.sql queries, which are unhashable, reach the cursor unchanged"""
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchall.return_value = []
+    repo = RepositoriesRepository(mock_db_connection)
+
+    query = sql.SQL("SELECT * FROM {}").format(sql.Identifier("repositories"))
+    assert repo.execute_query(query) == []
+    assert cursor.execute.call_args[0][0] is query
+
+    repo.execute_query("SELECT 1")
+    assert cursor.execute.call_args[0][0] == b"SELECT 1"
+
+
+def test_prepared_statement_prepared_once_per_connection(mock_db_connection):
+    """Test prepared getters PREPARE on first use and only send EXECUTE afterwards"""
+    cursor = mock_db_connection.cursor.return_value
+    cursor.fetchone.return_value = None
+    cursor.fetchall.return_value = []
+    repo = RepositoriesRepository(mock_db_connection)
+
+    assert repo.get_repository("test-owner/test-repo") is None
+    statements = [call[0][0] for call in cursor.execute.call_args_list]
+    assert statements[0].startswith("SELECT 1 FROM pg_prepared_statements")
+    assert statements[1].startswith("PREPARE get_repository AS") and "$1" in statements[1]
+    assert statements[2] == "EXECUTE get_repository (%s)"
+
+    cursor.execute.reset_mock()
+    RepositoriesRepository(mock_db_connection).get_repository("test-owner/test-repo")
+    assert [call[0] for call in cursor.execute.call_args_list] == [("EXECUTE get_repository (%s)", ("test-owner/test-repo",))]
+
+
+def test_prepared_statements_tracked_across_pool_checkouts(mock_db_connection):
+    """Test a raw connection checked out again in a new pool wrapper is not re-checked for prepared statements"""
+    cursor = mock_db_connection.cursor.return_value
+    cursor.connection = mock_db_connection
+    cursor.fetchone.return_value = None
+    cursor.fetchall.return_value = []
+
+    for _ in range(2):
+        connection = PooledConnection(Mock(), mock_db_connection)
+        RepositoriesRepository(connection).get_repository("test-owner/test-repo")
+        connection.close()
+    statements = [call[0][0] for call in cursor.execute.call_args_list]
+    assert sum(statement.startswith("SELECT 1 FROM pg_prepared_statements") for statement in statements) == 1
+    assert statements.count("EXECUTE get_repository (%s)") == 2
+
+
+def test_pull_request_batching_flushes_in_bulk(mock_db_connection, monkeypatch):
+    """Test batched set_pull_request calls are written together once the buffer is full"""
+    repo = PullRequestsRepository(mock_db_connection)
+    batches = []
+    monkeypatch.setattr(repo, "store_pull_requests_bulk", lambda prs: batches.append(prs) or len(prs))
+    repo.enable_batching(flush_every=2, max_age_s=60)
+
+    prs = [PullRequest(number=n, repository_full_name="o/r", uid=1, hotkey="hk", github_id="gh",
+                       title="t", author_login="a", merged_at=None, created_at=None) for n in range(3)]
+    assert all(repo.set_pull_request(pr) for pr in prs)
+    assert batches == [prs[:2]]
+    mock_db_connection.cursor.assert_not_called()
+
+    assert repo.flush() == 1
+    assert batches == [prs[:2], prs[2:]]
+
+
+def test_pull_request_batching_flushed_on_close(mock_db_connection, monkeypatch):
+    """Test closing a batching repository writes its buffered pull requests"""
+    repo = PullRequestsRepository(mock_db_connection)
+    batches = []
+    monkeypatch.setattr(repo, "store_pull_requests_bulk", lambda prs: batches.append(prs) or len(prs))
+    repo.enable_batching(flush_every=10, max_age_s=60)
+
+    pr = PullRequest(number=1, repository_full_name="o/r", uid=1, hotkey="hk", github_id="gh",
+                     title="t", author_login="a", merged_at=None, created_at=None)
+    assert repo.set_pull_request(pr)
+    assert batches == []
+    repo.close()
+    assert batches == [[pr]]
+
+
+def test_pull_request_batching_failed_flush_drops_batch(mock_db_connection, monkeypatch):
+    """Test a failed batch write is reported by flush() even though set_pull_request returned True"""
+    def failing_execute_values(*args, **kwargs):
+        raise RuntimeError("insert or update on table violates foreign key constraint")
+
+    monkeypatch.setattr(pull_requests_repository, "execute_values", failing_execute_values)
+    repo = PullRequestsRepository(mock_db_connection)
+    repo.enable_batching(flush_every=10, max_age_s=60)
+
+    pr = PullRequest(number=1, repository_full_name="o/r", uid=1, hotkey="hk", github_id="gh",
+                     title="t", author_login="a", merged_at=None, created_at=None)
+    assert repo.set_pull_request(pr)
+    assert repo.flush() == 0
+    # The batch was dropped, so a second flush has nothing to write
+    assert repo.flush() == 0
+    mock_db_connection.rollback.assert_called_once()
+
+
+def test_pull_request_numpy_uids_converted_without_mutation(mock_db_connection, monkeypatch):
+    """Test numpy uids of any integer width reach psycopg2 as ints and the PullRequest is left untouched"""
+    cursor = mock_db_connection.cursor.return_value
+    repo = PullRequestsRepository(mock_db_connection)
+    pr = PullRequest(number=1, repository_full_name="o/r", uid=np.uint16(7), hotkey="hk", github_id="gh",
+                     title="t", author_login="a", merged_at=None, created_at=None)
+
+    assert repo.set_pull_request_sync(pr)
+    uid = cursor.execute.call_args[0][1][2]
+    assert type(uid) is int and uid == 7
+    assert type(pr.uid) is np.uint16
+
+    rows = []
+    monkeypatch.setattr(pull_requests_repository, "execute_values",
+                        lambda cursor, query, values, **kwargs: rows.extend(values))
+    assert repo.store_pull_requests_bulk([pr, replace(pr, number=2, uid=np.int32(8)), replace(pr, number=3, uid=9)]) == 3
+    assert [(type(row[2]), row[2]) for row in rows] == [(int, 7), (int, 8), (int, 9)]
+
+    # A uid numpy cannot batch as an integer falls back to converting uid by uid
+    rows.clear()
+    assert repo.store_pull_requests_bulk([pr, replace(pr, number=2, uid=None)]) == 2
+    assert [(type(row[2]), row[2]) for row in rows] == [(int, 7), (type(None), None)]
+
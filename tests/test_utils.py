@@ -0,0 +1,28 @@
+"""
+Test timestamp utilities
+File: tests/test_utils.py
+"""
+import pytest
+from datetime import datetime, timezone
+from src.gittensor_db.utils import utils
+
+
+def test_parse_github_timestamp_converts_to_chicago():
+    """Test GitHub UTC timestamps are returned in Chicago time"""
+    parsed = utils.parse_github_timestamp("2024-01-15T16:30:00Z")
+    assert parsed == datetime(2024, 1, 15, 16, 30, tzinfo=timezone.utc)
+    assert parsed.utcoffset().total_seconds() == -6 * 3600
+
+
+def test_chicago_tz_falls_back_to_pytz_without_tz_database(monkeypatch):
+    """Test a host without zone data for zoneinfo uses pytz instead of failing at import"""
+    zoneinfo = pytest.importorskip("zoneinfo")
+    pytz = pytest.importorskip("pytz")
+
+    def missing_zone(key):
+        raise zoneinfo.ZoneInfoNotFoundError(f"No time zone found with key {key}")
+
+    monkeypatch.setattr(zoneinfo, "ZoneInfo", missing_zone)
+    tz = utils._load_chicago_tz()
+    assert tz is pytz.timezone("America/Chicago")
+    assert datetime(2024, 7, 1, tzinfo=timezone.utc).astimezone(tz).utcoffset().total_seconds() == -5 * 3600